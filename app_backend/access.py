@@ -0,0 +1,117 @@
+"""Rise/set access windows between constellation satellites and ground targets.
+
+Windows are found by sampling elevation on a fixed time grid for every
+(satellite, target, epoch) at once and interpolating the horizon crossings,
+the same approach as the GMAT ContactLocator (StepSize = 10 s).
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Sequence
+
+import numpy as np
+
+from orbit import Constellation, CONSTELLATION_EPOCH, eci_to_ecef, geodetic_to_ecef
+
+# Keep the (n_sat x n_target x n_epoch) elevation block to a few MB per chunk
+MAX_SAMPLES_PER_CHUNK = 2_000_000
+
+
+@dataclass
+class AccessTarget:
+    lat: float
+    lon: float
+    min_elevation: float = 5.0  # deg
+
+
+@dataclass
+class Window:
+    sat_index: int
+    target_index: int
+    rise_time: datetime
+    set_time: datetime
+    max_elevation: float  # deg
+
+
+def _up_vectors(targets: Sequence[AccessTarget]) -> np.ndarray:
+    lat = np.deg2rad([t.lat for t in targets])
+    lon = np.deg2rad([t.lon for t in targets])
+    return np.stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+def elevations(constellation: Constellation, targets: Sequence[AccessTarget], seconds: np.ndarray) -> np.ndarray:
+    """Elevation angles (deg) with shape (n_sat, n_target, n_epoch)"""
+    sat_ecef = eci_to_ecef(constellation.propagate(seconds), seconds)
+    site = geodetic_to_ecef([t.lat for t in targets], [t.lon for t in targets])
+    up = _up_vectors(targets)
+    rho = sat_ecef[:, None, :, :] - site[None, :, None, :]
+    sin_el = np.einsum("stkc,tc->stk", rho, up) / np.linalg.norm(rho, axis=-1)
+    return np.rad2deg(np.arcsin(np.clip(sin_el, -1.0, 1.0)))
+
+
+def _crossing(t0, t1, e0, e1, threshold):
+    frac = np.where(e1 != e0, (threshold - e0) / (e1 - e0), 0.0)
+    return t0 + np.clip(frac, 0.0, 1.0) * (t1 - t0)
+
+
+def compute_windows(
+    constellation: Constellation,
+    targets: Sequence[AccessTarget],
+    start: datetime,
+    end: datetime,
+    step_seconds: float = 10.0,
+) -> List[Window]:
+    """All access windows in [start, end]; windows still open at either edge are clipped to it"""
+    if end <= start or not len(constellation) or not targets:
+        return []
+
+    offset = (start - CONSTELLATION_EPOCH).total_seconds()
+    span = (end - start).total_seconds()
+    grid = np.append(np.arange(0.0, span, step_seconds), span)
+    thresholds = np.array([t.min_elevation for t in targets])[None, :, None]
+
+    per_epoch = len(constellation) * len(targets)
+    chunk = max(int(MAX_SAMPLES_PER_CHUNK // per_epoch), 2)
+
+    windows = []
+    open_passes = {}  # (sat, target) -> [rise_seconds, peak_elevation, rise_index_in_chunk]
+    prev_tail = None  # last sample of the previous chunk, so crossings between chunks are seen
+    for lo in range(0, len(grid), chunk):
+        times = grid[lo:lo + chunk]
+        elev = elevations(constellation, targets, offset + times)
+        if prev_tail is None:
+            # Passes already in progress at the start of the span
+            for s, g in zip(*np.nonzero(elev[..., 0] >= thresholds[..., 0])):
+                open_passes[(s, g)] = [0.0, -90.0, 0]
+        else:
+            times = np.concatenate(([prev_tail[0]], times))
+            elev = np.concatenate((prev_tail[1], elev), axis=-1)
+
+        change = np.diff((elev >= thresholds).astype(np.int8), axis=-1)
+        for s, g, k in zip(*np.nonzero(change)):
+            when = float(_crossing(times[k], times[k + 1], elev[s, g, k], elev[s, g, k + 1], thresholds[0, g, 0]))
+            if change[s, g, k] > 0:
+                open_passes[(s, g)] = [when, -90.0, k + 1]
+            else:
+                rise, peak, first = open_passes.pop((s, g))
+                peak = max(peak, float(elev[s, g, first:k + 1].max()))
+                windows.append((s, g, rise, when, peak))
+
+        for (s, g), state in open_passes.items():
+            state[1] = max(state[1], float(elev[s, g, state[2]:].max()))
+            state[2] = 0
+        prev_tail = (times[-1], elev[..., -1:])
+
+    for (s, g), (rise, peak, _) in open_passes.items():
+        windows.append((s, g, rise, span, peak))
+    windows.sort(key=lambda w: (w[2], w[0], w[1]))
+
+    return [
+        Window(
+            sat_index=int(s),
+            target_index=int(g),
+            rise_time=start + timedelta(seconds=rise),
+            set_time=start + timedelta(seconds=set_),
+            max_elevation=float(peak),
+        )
+        for s, g, rise, set_, peak in windows
+    ]
@@ -0,0 +1,103 @@
+"""Throughput of GET /bookings with N parallel clients, blocking vs async sessions.
+
+"before" serves the same query through the old pattern (a sync Session used
+inside an async route, which blocks the event loop); "after" is the real
+async route. Each client also pings GET / so the stall shows up as latency
+on an unrelated cheap endpoint too.
+
+Run from app_backend/:  python -m benchmarks.concurrency [--clients 1 8 32] [--bookings 5000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy.orm import Session, joinedload  # noqa: E402
+
+import main as backend  # noqa: E402
+
+
+@backend.app.get("/bench/blocking-bookings")
+async def blocking_bookings(
+    db: Session = Depends(backend.get_db),
+    current_user: backend.User = Depends(backend.get_current_user),
+):
+    bookings = db.query(backend.Booking).options(joinedload(backend.Booking.satellite)).filter(
+        backend.Booking.user_id == current_user.id
+    ).order_by(backend.Booking.created_at.desc()).all()
+    return [backend.BookingResponse.model_validate(b) for b in bookings]
+
+
+def seed(bookings: int) -> str:
+    db = backend.SessionLocal()
+    try:
+        backend.seed_satellites(db)
+        user = backend.User(email="bench@example.com", full_name="Bench")
+        db.add(user)
+        db.commit()
+        db.bulk_insert_mappings(backend.Booking, [
+            {
+                "user_id": user.id,
+                "satellite_id": i % 32 + 1,
+                "object_name": f"object-{i}",
+                "object_type": "star",
+                "booking_type": "photograph",
+                "status": "pending",
+            }
+            for i in range(bookings)
+        ])
+        db.commit()
+        return backend.create_access_token({"user_id": user.id, "email": user.email})
+    finally:
+        db.close()
+
+
+async def run(path: str, clients: int, requests: int, headers: dict):
+    heavy, light = [], []
+
+    async def client_loop(client):
+        for _ in range(requests):
+            started = time.perf_counter()
+            ping = asyncio.ensure_future(client.get("/"))
+            response = await client.get(path, headers=headers)
+            heavy.append(time.perf_counter() - started)
+            response.raise_for_status()
+            await ping
+            light.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return clients * requests / elapsed, heavy, light
+
+
+def pct(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=10, help="requests per client")
+    parser.add_argument("--bookings", type=int, default=5000)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {seed(args.bookings)}"}
+    print(f"{'variant':8} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'ping p95 ms':>12}")
+    for clients in args.clients:
+        for name, path in (("before", "/bench/blocking-bookings"), ("after", "/bookings")):
+            throughput, heavy, light = asyncio.run(run(path, clients, args.requests, headers))
+            print(f"{name:8} {clients:>7} {throughput:>8.1f} {pct(heavy, 50):>8.1f} "
+                  f"{pct(heavy, 95):>8.1f} {pct(light, 95):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
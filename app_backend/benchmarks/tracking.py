@@ -0,0 +1,49 @@
+"""Throughput of the batched Kalman tracker and RTS smoother.
+
+Run from app_backend/:  python -m benchmarks.tracking [--objects N] [--steps T]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tracking import TrackBank, rts_smooth
+
+
+def simulate(objects: int, steps: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = rng.normal(scale=1000.0, size=(objects, dim))
+    velocity = rng.normal(scale=7.0, size=(objects, dim))
+    times = np.arange(steps, dtype=np.float64)
+    truth = start[:, None, :] + velocity[:, None, :] * times[None, :, None]
+    return times, truth + rng.normal(size=truth.shape)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=3)
+    args = parser.parse_args()
+
+    times, measurements = simulate(args.objects, args.steps, args.dim)
+    keys = list(range(args.objects))
+
+    bank = TrackBank(dim=args.dim, capacity=args.objects)
+    started = time.perf_counter()
+    for k in range(args.steps):
+        bank.ingest(keys, np.full(args.objects, times[k]), measurements[:, k])
+    elapsed = time.perf_counter() - started
+    updates = args.objects * args.steps
+    print(f"filter:   {updates:,} predict+update steps in {elapsed:.3f}s "
+          f"-> {updates / elapsed:,.0f} objects/s")
+
+    started = time.perf_counter()
+    rts_smooth(np.tile(times, (args.objects, 1)), measurements, dim=args.dim)
+    elapsed = time.perf_counter() - started
+    print(f"smoother: {args.objects:,} tracks x {args.steps} steps in {elapsed:.3f}s "
+          f"-> {args.objects / elapsed:,.0f} tracks/s")
+
+
+if __name__ == "__main__":
+    main()
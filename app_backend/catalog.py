@@ -0,0 +1,108 @@
+"""In-process satellite catalog, reloaded only when its version changes.
+
+The catalog is read on nearly every request but written almost never, so the
+whole table is kept in memory as an immutable snapshot. Writers bump
+`version` (see `invalidate`); the next reader notices the mismatch and
+reloads once. Snapshots are replaced, never mutated, so readers need no lock.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from orbit import CONSTELLATION, slot_for_designation
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    loaded_at: float
+    by_id: Dict[int, Any]
+    active: Tuple[Any, ...]
+    # Active satellites that have a slot in the propagated constellation, and those slots
+    ranked: Tuple[Any, ...]
+    slots: np.ndarray
+
+    def get(self, satellite_id: int, active_only: bool = True) -> Optional[Any]:
+        sat = self.by_id.get(satellite_id)
+        if sat is None or (active_only and not sat.is_active):
+            return None
+        return sat
+
+    @property
+    def active_ids(self):
+        return [sat.id for sat in self.active]
+
+
+class SatelliteCatalog:
+    """Versioned snapshot of the satellites table.
+
+    `loader()` returns every satellite record (anything with id, designation
+    and is_active attributes), ordered by id. `max_age` bounds how long a
+    snapshot is trusted, so changes made by other processes are picked up too.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Any]], max_age: float = 300.0):
+        self._loader = loader
+        self.max_age = max_age
+        self.version = 0
+        self.loads = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.loaded_at < self.max_age
+        )
+
+    def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if self._fresh(snapshot):
+                return snapshot
+            # Tag with the version seen before loading; a write racing the load forces another one
+            version = self.version
+            records = list(self._loader())
+            active = tuple(sat for sat in records if sat.is_active)
+            ranked, slots = [], []
+            for sat in active:
+                slot = slot_for_designation(sat.designation)
+                if slot is not None and slot < len(CONSTELLATION):
+                    ranked.append(sat)
+                    slots.append(slot)
+            snapshot = CatalogSnapshot(
+                version=version,
+                loaded_at=time.monotonic(),
+                by_id={sat.id: sat for sat in records},
+                active=active,
+                ranked=tuple(ranked),
+                slots=np.asarray(slots, dtype=np.intp),
+            )
+            self._snapshot = snapshot
+            self.loads += 1
+            return snapshot
+
+    def get(self, satellite_id: int, active_only: bool = True) -> Optional[Any]:
+        return self.snapshot().get(satellite_id, active_only)
+
+    def invalidate(self):
+        """Mark the current snapshot stale; call after committing satellite changes"""
+        with self._lock:
+            self.version += 1
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "name": "satellite_catalog",
+            "version": self.version,
+            "loads": self.loads,
+            "satellites": len(snapshot.by_id) if snapshot else 0,
+            "active": len(snapshot.active) if snapshot else 0,
+        }
@@ -1,21 +1,36 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy import Float, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Float, Text, ForeignKey, Index, update, select, insert, event, tuple_
+from sqlalchemy.orm import relationship, joinedload
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import List
 from pydantic import BaseModel, EmailStr, validator
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import jwt
 import httpx
+import asyncio
+from contextlib import asynccontextmanager
 from passlib.context import CryptContext
 import os
+<<<<<<< HEAD
+import threading
+=======
+import base64
+>>>>>>> 16bb454 ([user-010] Keyset-paginate GET /bookings with status/type filters)
 from dotenv import load_dotenv
-import random
+import numpy as np
+from orbit import CONSTELLATION
+from access import AccessTarget, compute_windows
+from scheduler import ScheduleRequest, schedule
+from slots import CalendarSet, SatelliteSlotIndex, to_seconds
+from tracking import TrackBank, rts_smooth
+from cache import TTLCache
+from catalog import SatelliteCatalog
 
 # Load .env from parent directory (main folder)
 env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
@@ -28,6 +43,49 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
+# Upstream Google APIs; point GOOGLE_API_BASE_URL at a local stub for load tests
+GOOGLE_API_BASE_URL = os.getenv("GOOGLE_API_BASE_URL", "https://www.googleapis.com").rstrip("/")
+GOOGLE_HTTP_TIMEOUT_SECONDS = float(os.getenv("GOOGLE_HTTP_TIMEOUT_SECONDS", "10"))
+GOOGLE_HTTP_MAX_CONNECTIONS = int(os.getenv("GOOGLE_HTTP_MAX_CONNECTIONS", "100"))
+GOOGLE_HTTP_MAX_KEEPALIVE = int(os.getenv("GOOGLE_HTTP_MAX_KEEPALIVE", "20"))
+GOOGLE_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("GOOGLE_TOKEN_CACHE_TTL_SECONDS", "30"))
+
+# Authenticated-user cache (decoded JWT claims and user snapshots)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# In-memory satellite catalog; also reloaded after this long to pick up other processes' writes
+SATELLITE_CATALOG_MAX_AGE_SECONDS = float(os.getenv("SATELLITE_CATALOG_MAX_AGE_SECONDS", "300"))
+
+# Default ground target for /satellites/nearest (Kathmandu ground station in the GMAT script)
+DEFAULT_TARGET_LAT = float(os.getenv("DEFAULT_TARGET_LAT", "27.700769"))
+DEFAULT_TARGET_LON = float(os.getenv("DEFAULT_TARGET_LON", "85.300140"))
+
+# Access windows are precomputed over a rolling horizon (GMAT: 86400 s at 10 s steps)
+ACCESS_HORIZON_HOURS = float(os.getenv("ACCESS_HORIZON_HOURS", "24"))
+ACCESS_STEP_SECONDS = float(os.getenv("ACCESS_STEP_SECONDS", "10"))
+ACCESS_REFRESH_MINUTES = float(os.getenv("ACCESS_REFRESH_MINUTES", "30"))  # slack before extending
+ACCESS_RETENTION_HOURS = float(os.getenv("ACCESS_RETENTION_HOURS", "24"))
+
+# Batch scheduler
+SCHEDULER_DEFAULT_DURATION_MINUTES = int(os.getenv("SCHEDULER_DEFAULT_DURATION_MINUTES", "5"))
+SCHEDULER_MAX_DELAY_HOURS = float(os.getenv("SCHEDULER_MAX_DELAY_HOURS", "24"))
+SCHEDULER_ALLOW_REASSIGN = os.getenv("SCHEDULER_ALLOW_REASSIGN", "false").lower() == "true"
+# Comma-separated emails of the operators allowed to run it
+OPERATOR_EMAILS = {email.strip().lower() for email in os.getenv("OPERATOR_EMAILS", "").split(",") if email.strip()}
+
+# GET /bookings page size
+BOOKINGS_PAGE_DEFAULT_LIMIT = int(os.getenv("BOOKINGS_PAGE_DEFAULT_LIMIT", "100"))
+BOOKINGS_PAGE_MAX_LIMIT = int(os.getenv("BOOKINGS_PAGE_MAX_LIMIT", "500"))
+
+# Longest bookable slot; bounds how far back an overlapping booking can start
+BOOKING_MAX_DURATION_MINUTES = int(os.getenv("BOOKING_MAX_DURATION_MINUTES", "1440"))
+
+# Kalman tracking for "track" bookings (positions in km, times in s)
+TRACK_DIMENSIONS = int(os.getenv("TRACK_DIMENSIONS", "3"))
+TRACK_PROCESS_NOISE = float(os.getenv("TRACK_PROCESS_NOISE", "1e-3"))
+TRACK_MEASUREMENT_NOISE = float(os.getenv("TRACK_MEASUREMENT_NOISE", "1.0"))
+
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./satellite_booking.db")
 if DATABASE_URL.startswith("postgres://"):
@@ -36,6 +94,18 @@ engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} i
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine used by the routes, so queries never block the event loop
+def async_database_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
@@ -68,6 +138,11 @@ class Satellite(Base):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_satellite_scheduled", "satellite_id", "scheduled_time"),
+        # Keyset pagination of a user's bookings, newest first
+        Index("ix_bookings_user_created", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -75,9 +150,11 @@ class Booking(Base):
     object_name = Column(String, nullable=False)
     object_type = Column(String, nullable=False)
     booking_type = Column(String, nullable=False)  # photograph or track
-    status = Column(String, default="pending")  # pending, completed, failed
+    status = Column(String, default="pending")  # pending, scheduled, completed, failed
+    priority = Column(Integer, default=0)  # higher is scheduled first
     scheduled_time = Column(DateTime, nullable=True)
     duration = Column(Integer, nullable=True)  # in minutes
+    target_id = Column(Integer, ForeignKey("ground_targets.id"), nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -86,6 +163,43 @@ class Booking(Base):
     user = relationship("User")
     satellite = relationship("Satellite")
 
+class TrackMeasurement(Base):
+    __tablename__ = "track_measurements"
+    __table_args__ = (
+        Index("ix_track_measurements_booking_time", "booking_id", "measured_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False)
+    measured_at = Column(DateTime, nullable=False)
+    x = Column(Float, nullable=False)
+    y = Column(Float, nullable=False)
+    z = Column(Float, nullable=True)
+
+class GroundTarget(Base):
+    __tablename__ = "ground_targets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    latitude = Column(Float, nullable=False)  # in deg
+    longitude = Column(Float, nullable=False)  # in deg
+    min_elevation = Column(Float, nullable=False, default=5.0)  # in deg
+    windows_until = Column(DateTime, nullable=True)  # end of the precomputed horizon
+
+class AccessWindow(Base):
+    __tablename__ = "access_windows"
+    __table_args__ = (
+        Index("ix_access_windows_target_rise", "target_id", "rise_time"),
+        Index("ix_access_windows_satellite_target_rise", "satellite_id", "target_id", "rise_time"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    satellite_id = Column(Integer, ForeignKey("satellites.id"), nullable=False)
+    target_id = Column(Integer, ForeignKey("ground_targets.id"), nullable=False)
+    rise_time = Column(DateTime, nullable=False)
+    set_time = Column(DateTime, nullable=False)
+    max_elevation = Column(Float, nullable=False)  # in deg
+
 Base.metadata.create_all(bind=engine)
 
 # Pydantic Models
@@ -134,6 +248,8 @@ class BookingCreate(BaseModel):
     satellite_id: int
     scheduled_time: Optional[datetime] = None
     duration: Optional[int] = None
+    target_id: Optional[int] = None
+    priority: int = 0
     notes: Optional[str] = None
     
     @validator('booking_type')
@@ -141,6 +257,12 @@ class BookingCreate(BaseModel):
         if v not in ['photograph', 'track']:
             raise ValueError('Booking type must be either "photograph" or "track"')
         return v
+    
+    @validator('duration')
+    def validate_duration(cls, v):
+        if v is not None and not 0 <= v <= BOOKING_MAX_DURATION_MINUTES:
+            raise ValueError(f'Duration must be between 0 and {BOOKING_MAX_DURATION_MINUTES} minutes')
+        return v
 
 class BookingResponse(BaseModel):
     id: int
@@ -150,13 +272,104 @@ class BookingResponse(BaseModel):
     status: str
     scheduled_time: Optional[datetime]
     duration: Optional[int]
+    priority: Optional[int] = 0
     notes: Optional[str]
     created_at: datetime
     satellite: SatelliteResponse
     
     model_config = {"from_attributes": True}
+
+class MeasurementIn(BaseModel):
+    booking_id: int
+    time: datetime
+    position: List[float]
+    
+    @validator('position')
+    def validate_position(cls, v):
+        if len(v) != TRACK_DIMENSIONS:
+            raise ValueError(f'Position must have {TRACK_DIMENSIONS} components')
+        return v
+
+class MeasurementBatch(BaseModel):
+    measurements: List[MeasurementIn]
+
+class MeasurementBatchResponse(BaseModel):
+    accepted: int
+    rejected_booking_ids: List[int]
+
+class TrackStateResponse(BaseModel):
+    booking_id: int
+    time: datetime
+    state: List[float]  # position then velocity
+    covariance: List[List[float]]
+    updates: int
+
+class SmoothRequest(BaseModel):
+    booking_ids: List[int]
+
+class SmoothedPoint(BaseModel):
+    time: datetime
+    state: List[float]
+
+class SmoothedTrackResponse(BaseModel):
+    booking_id: int
+    points: List[SmoothedPoint]
+
+class ScheduleRunResponse(BaseModel):
+    considered: int
+    scheduled: int
+    unassigned: int
+    elapsed_seconds: float
+    bookings_per_second: float
+
+class GroundTargetResponse(BaseModel):
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    min_elevation: float
+    
+    model_config = {"from_attributes": True}
+
+class AccessWindowResponse(BaseModel):
+    satellite_id: int
+    target_id: int
+    rise_time: datetime
+    set_time: datetime
+    max_elevation: float
+    
+    model_config = {"from_attributes": True}
+# Shared upstream HTTP client, created once per app lifetime
+http_clients = {}
+
+def get_google_client() -> httpx.AsyncClient:
+    client = http_clients.get("google")
+    if client is None:
+        client = http_clients["google"] = httpx.AsyncClient(
+            base_url=GOOGLE_API_BASE_URL,
+            timeout=GOOGLE_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=GOOGLE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=GOOGLE_HTTP_MAX_KEEPALIVE,
+            ),
+        )
+    return client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Seed once and load the catalog before the first request instead of on every request
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(seed_satellites)
+    await asyncio.to_thread(satellite_catalog.snapshot)
+    get_google_client()
+    yield
+    for client in http_clients.values():
+        await client.aclose()
+    http_clients.clear()
+    await async_engine.dispose()
+
 # FastAPI app
-app = FastAPI(title="Satellite Booking API")
+app = FastAPI(title="Satellite Booking API", lifespan=lifespan)
 
 # CORS configuration for Electron
 app.add_middleware(
@@ -175,6 +388,16 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 # JWT token functions
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -183,22 +406,43 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+token_cache = TTLCache("auth_tokens", max_entries=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache("auth_users", max_entries=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS)
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    # Never serve cached claims past the token's own expiry
+    token_cache.set(token, payload, ttl=payload.get("exp", 0) - datetime.now(timezone.utc).timestamp())
+    return payload
 
-def get_current_user(db: Session = Depends(get_db), token_data: dict = Depends(verify_token)):
-    user = db.query(User).filter(User.id == token_data.get("user_id")).first()
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token_data: dict = Depends(verify_token)):
+    """Current user as a detached snapshot; re-query by id before modifying it"""
+    user_id = token_data.get("user_id")
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    db.expunge(user)
+    user_cache.set(user_id, user)
     return user
 
+async def get_operator_user(current_user: User = Depends(get_current_user)):
+    """Current user, if listed in OPERATOR_EMAILS"""
+    if current_user.email.lower() not in OPERATOR_EMAILS:
+        raise HTTPException(status_code=403, detail="Operator access required")
+    return current_user
+
 def seed_satellites(db: Session):
     """Seed initial satellites if none exist"""
     if db.query(Satellite).count() == 0:
@@ -239,38 +483,347 @@ def seed_satellites(db: Session):
         db.add_all(satellites)
         db.commit()
 
+def load_satellite_catalog():
+    """Every satellite as a detached response model, for the in-memory catalog"""
+    db = SessionLocal()
+    try:
+        return [SatelliteResponse.model_validate(sat) for sat in db.query(Satellite).order_by(Satellite.id)]
+    finally:
+        db.close()
+
+satellite_catalog = SatelliteCatalog(load_satellite_catalog, max_age=SATELLITE_CATALOG_MAX_AGE_SECONDS)
+
+@event.listens_for(Session, "after_flush")
+def _note_satellite_changes(session, flush_context):
+    if any(isinstance(obj, Satellite) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["satellites_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_satellite_catalog(session):
+    # ORM writes only; bulk/Core UPDATEs of satellites must call satellite_catalog.invalidate()
+    if session.info.pop("satellites_changed", False):
+        satellite_catalog.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_satellite_changes(session):
+    session.info.pop("satellites_changed", None)
+
+def seed_ground_targets(db: Session):
+    """Seed the ground stations from gmat_orbit_simulation.script if none exist"""
+    if db.query(GroundTarget).count() == 0:
+        targets = [
+            GroundTarget(name="Kathmandu", latitude=27.700769, longitude=85.300140, min_elevation=5.0),
+            GroundTarget(name="CapeCanaveral", latitude=28.396837, longitude=-80.605659, min_elevation=5.0),
+            GroundTarget(name="Rome", latitude=41.902782, longitude=12.496366, min_elevation=5.0),
+        ]
+        db.add_all(targets)
+        db.commit()
+
+# Held around refreshes run in worker threads, so a burst of requests computes each range once
+access_refresh_lock = threading.Lock()
+
+def refresh_access_windows(db: Session, now: Optional[datetime] = None):
+    """Extend precomputed access windows so they cover now + ACCESS_HORIZON_HOURS.
+
+    Only the part of the horizon that has newly come into range is computed;
+    a pass clipped at the previous horizon edge is extended in place.
+    """
+    seed_ground_targets(db)
+    now = now or datetime.utcnow()
+    horizon_end = now + timedelta(hours=ACCESS_HORIZON_HOURS)
+    refresh_at = horizon_end - timedelta(minutes=ACCESS_REFRESH_MINUTES)
+
+    stale = [
+        t for t in db.query(GroundTarget).all()
+        if t.windows_until is None or t.windows_until < refresh_at
+    ]
+    if not stale:
+        return
+
+    catalog = satellite_catalog.snapshot()
+    satellites = catalog.ranked
+    constellation = CONSTELLATION.subset(catalog.slots)
+
+    # Targets sharing a horizon edge are computed together in one vectorized pass
+    by_start = {}
+    for target in stale:
+        start = target.windows_until if target.windows_until and target.windows_until > now else now
+        by_start.setdefault(start, []).append(target)
+
+    for start, targets in by_start.items():
+        windows = compute_windows(
+            constellation,
+            [AccessTarget(t.latitude, t.longitude, t.min_elevation) for t in targets],
+            start,
+            horizon_end,
+            step_seconds=ACCESS_STEP_SECONDS,
+        )
+
+        # Passes clipped at the old horizon edge continue from exactly `start`
+        clipped = {
+            (w.satellite_id, w.target_id): w
+            for w in db.query(AccessWindow).filter(
+                AccessWindow.target_id.in_([t.id for t in targets]),
+                AccessWindow.set_time == start,
+            )
+        }
+        rows = []
+        for w in windows:
+            satellite_id = satellites[w.sat_index].id
+            target_id = targets[w.target_index].id
+            previous = clipped.pop((satellite_id, target_id), None) if w.rise_time == start else None
+            if previous is not None:
+                previous.set_time = w.set_time
+                previous.max_elevation = max(previous.max_elevation, w.max_elevation)
+                continue
+            rows.append({
+                "satellite_id": satellite_id,
+                "target_id": target_id,
+                "rise_time": w.rise_time,
+                "set_time": w.set_time,
+                "max_elevation": w.max_elevation,
+            })
+        db.bulk_insert_mappings(AccessWindow, rows)
+        for target in targets:
+            target.windows_until = horizon_end
+
+    db.query(AccessWindow).filter(
+        AccessWindow.set_time < now - timedelta(hours=ACCESS_RETENTION_HOURS)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+async def ensure_access_windows():
+    """refresh_access_windows on its own session in a worker thread, off the event loop"""
+    def refresh():
+        with access_refresh_lock:
+            db = SessionLocal()
+            try:
+                refresh_access_windows(db)
+            finally:
+                db.close()
+    await asyncio.to_thread(refresh)
+
+def find_access_window(db: Session, satellite_id: int, target_id: int, start: datetime, end: datetime):
+    """Return the access window covering [start, end] for a satellite/target pair, if any"""
+    return db.query(AccessWindow).filter(
+        AccessWindow.satellite_id == satellite_id,
+        AccessWindow.target_id == target_id,
+        AccessWindow.rise_time <= start,
+        AccessWindow.set_time >= end,
+    ).first()
+
+# Statuses whose slot is still reserved on the satellite
+ACTIVE_BOOKING_STATUSES = ("pending", "scheduled")
+
+def load_satellite_slots(satellite_id: int):
+    """Reserved (start, end, booking_id) slots of one satellite, for the in-memory index"""
+    db = SessionLocal()
+    try:
+        rows = db.query(Booking.id, Booking.scheduled_time, Booking.duration).filter(
+            Booking.satellite_id == satellite_id,
+            Booking.scheduled_time.isnot(None),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        ).all()
+    finally:
+        db.close()
+    return [
+        (to_seconds(r.scheduled_time), to_seconds(r.scheduled_time) + 60.0 * (r.duration or 0), r.id)
+        for r in rows
+    ]
+
+slot_index = SatelliteSlotIndex(load_satellite_slots)
+
+def lock_satellite_slots(db: Session, satellite_id: int):
+    """Serialize slot writes for one satellite until the current transaction ends.
+
+    A no-op UPDATE takes the row lock on PostgreSQL and the database write
+    lock on SQLite, so two requests can never both pass the overlap check.
+    """
+    db.execute(update(Satellite).where(Satellite.id == satellite_id).values(id=Satellite.id))
+
+def find_slot_conflict(db: Session, satellite_id: int, start: datetime, end: datetime):
+    """First reserved booking on the satellite overlapping [start, end), via the composite index"""
+    candidates = db.query(Booking.id, Booking.scheduled_time, Booking.duration).filter(
+        Booking.satellite_id == satellite_id,
+        Booking.scheduled_time > start - timedelta(minutes=BOOKING_MAX_DURATION_MINUTES),
+        Booking.scheduled_time < end,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+    )
+    for b in candidates:
+        if b.scheduled_time + timedelta(minutes=b.duration or 0) > start or b.scheduled_time == start:
+            return b
+    return None
+
+def schedule_pending_bookings(db: Session, now: Optional[datetime] = None) -> ScheduleRunResponse:
+    """Assign every pending booking to a conflict-free satellite slot in one run"""
+    now = now or datetime.utcnow()
+    with access_refresh_lock:
+        refresh_access_windows(db, now)
+
+    def seconds(value: datetime) -> float:
+        return (value - now).total_seconds()
+
+    pending = db.query(
+        Booking.id, Booking.satellite_id, Booking.scheduled_time, Booking.duration,
+        Booking.priority, Booking.target_id,
+    ).filter(Booking.status == "pending").all()
+    requests = [
+        ScheduleRequest(
+            booking_id=b.id,
+            satellite_id=b.satellite_id,
+            earliest=max(seconds(b.scheduled_time), 0.0) if b.scheduled_time else 0.0,
+            duration=60.0 * (b.duration or SCHEDULER_DEFAULT_DURATION_MINUTES),
+            priority=b.priority or 0,
+            target_id=b.target_id,
+        )
+        for b in pending
+    ]
+
+    # Slots already handed out in earlier runs stay taken
+    calendars = CalendarSet()
+    calendars.load(
+        (b.satellite_id, seconds(b.scheduled_time),
+         seconds(b.scheduled_time) + 60.0 * (b.duration or SCHEDULER_DEFAULT_DURATION_MINUTES), b.id)
+        for b in db.query(
+            Booking.id, Booking.satellite_id, Booking.scheduled_time, Booking.duration
+        ).filter(Booking.status == "scheduled", Booking.scheduled_time.isnot(None))
+    )
+
+    windows = {}
+    target_ids = {r.target_id for r in requests if r.target_id is not None}
+    if target_ids:
+        for w in db.query(
+            AccessWindow.satellite_id, AccessWindow.target_id, AccessWindow.rise_time, AccessWindow.set_time
+        ).filter(
+            AccessWindow.target_id.in_(target_ids), AccessWindow.set_time > now
+        ).order_by(AccessWindow.rise_time):
+            windows.setdefault((w.satellite_id, w.target_id), []).append(
+                (seconds(w.rise_time), seconds(w.set_time))
+            )
+
+    satellite_ids = satellite_catalog.snapshot().active_ids
+    result = schedule(
+        requests,
+        satellite_ids,
+        calendars=calendars,
+        windows=windows,
+        max_delay=SCHEDULER_MAX_DELAY_HOURS * 3600.0,
+        allow_reassign=SCHEDULER_ALLOW_REASSIGN,
+    )
+
+    db.bulk_update_mappings(Booking, [
+        {
+            "id": a.booking_id,
+            "satellite_id": a.satellite_id,
+            "scheduled_time": now + timedelta(seconds=a.start),
+            "duration": int(round(a.duration / 60.0)),
+            "status": "scheduled",
+            "updated_at": now,
+        }
+        for a in result.assignments
+    ])
+    db.commit()
+    slot_index.invalidate()
+
+    return ScheduleRunResponse(
+        considered=len(requests),
+        scheduled=len(result.assignments),
+        unassigned=len(result.unassigned),
+        elapsed_seconds=result.elapsed,
+        bookings_per_second=result.throughput,
+    )
+
+track_bank = TrackBank(
+    dim=TRACK_DIMENSIONS,
+    process_noise=TRACK_PROCESS_NOISE,
+    measurement_noise=TRACK_MEASUREMENT_NOISE,
+)
+
+_COORDINATES = ("x", "y", "z")
+
+def measurement_row_position(m: TrackMeasurement):
+    return [getattr(m, c) for c in _COORDINATES[:TRACK_DIMENSIONS]]
+
+def from_seconds(value: float) -> datetime:
+    return datetime(1970, 1, 1) + timedelta(seconds=float(value))
+
+def owned_track_bookings(db: Session, user_id: int, booking_ids) -> set:
+    """Subset of booking_ids that are "track" bookings of the user"""
+    return {
+        bid for (bid,) in db.query(Booking.id).filter(
+            Booking.id.in_(set(booking_ids)),
+            Booking.user_id == user_id,
+            Booking.booking_type == "track",
+        )
+    }
+
+def load_track_measurements(db: Session, booking_ids):
+    """Stored measurements grouped per booking, in time order"""
+    grouped = {bid: [] for bid in booking_ids}
+    for m in db.query(TrackMeasurement).filter(
+        TrackMeasurement.booking_id.in_(booking_ids)
+    ).order_by(TrackMeasurement.booking_id, TrackMeasurement.measured_at):
+        grouped[m.booking_id].append(m)
+    return grouped
+
+def replay_track(db: Session, booking_id: int) -> bool:
+    """Rebuild a track's filter state from stored measurements (e.g. after a restart)"""
+    rows = load_track_measurements(db, [booking_id])[booking_id]
+    if not rows:
+        return False
+    track_bank.ingest(
+        [booking_id] * len(rows),
+        [to_seconds(m.measured_at) for m in rows],
+        [measurement_row_position(m) for m in rows],
+    )
+    return True
+
+google_token_cache = TTLCache("google_tokens", max_entries=AUTH_CACHE_MAX_ENTRIES, ttl=GOOGLE_TOKEN_CACHE_TTL_SECONDS)
+
+async def verify_google_token(token: str) -> dict:
+    """Verify a Google access token and return its user info.
+
+    tokeninfo and userinfo are requested concurrently over the pooled client;
+    verified results are cached briefly so login bursts skip the round trips.
+    """
+    user_info = google_token_cache.get(token)
+    if user_info is not None:
+        return user_info
+    
+    client = get_google_client()
+    token_response, user_info_response = await asyncio.gather(
+        client.get("/oauth2/v3/tokeninfo", params={"access_token": token}),
+        client.get("/oauth2/v2/userinfo", headers={"Authorization": f"Bearer {token}"}),
+    )
+    if token_response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid Google token")
+    user_info = user_info_response.json()
+    
+    try:
+        expires_in = float(token_response.json().get("expires_in", GOOGLE_TOKEN_CACHE_TTL_SECONDS))
+    except (TypeError, ValueError):
+        expires_in = GOOGLE_TOKEN_CACHE_TTL_SECONDS
+    if user_info_response.status_code == 200:
+        google_token_cache.set(token, user_info, ttl=expires_in)
+    return user_info
+
 # Routes
 @app.get("/")
 async def root():
     return {"message": "Satellite Booking API", "status": "running"}
 
 @app.post("/auth/google", response_model=TokenResponse)
-async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(auth_request: GoogleAuthRequest, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user with Google OAuth token"""
     try:
-        # Verify Google token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.googleapis.com/oauth2/v3/tokeninfo?access_token={auth_request.token}"
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid Google token")
-            
-            google_data = response.json()
-            
-            # Get user info
-            user_info_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {auth_request.token}"}
-            )
-            user_info = user_info_response.json()
+        user_info = await verify_google_token(auth_request.token)
         
         email = user_info.get("email")
         google_id = user_info.get("id")
         
         # Check if user exists
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
         
         if not user:
             # Create new user
@@ -282,8 +835,8 @@ async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get
                 is_profile_complete=False
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         
         # Create access token
         access_token = create_access_token({"user_id": user.id, "email": user.email})
@@ -294,6 +847,8 @@ async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get
             user=UserResponse.model_validate(user)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -306,61 +861,106 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def update_profile(
     profile_data: ProfileUpdateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user profile"""
+    user = await db.get(User, current_user.id)
     if profile_data.full_name:
-        current_user.full_name = profile_data.full_name
+        user.full_name = profile_data.full_name
     if profile_data.mobile_no:
-        current_user.mobile_no = profile_data.mobile_no
+        user.mobile_no = profile_data.mobile_no
     
     # Check if profile is complete
-    if current_user.full_name and current_user.mobile_no:
-        current_user.is_profile_complete = True
+    if user.full_name and user.mobile_no:
+        user.is_profile_complete = True
     
-    current_user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
+    user.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
     
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(user)
 
 
 @app.get("/satellites/nearest", response_model=List[SatelliteResponse])
 async def get_nearest_satellites(
     limit: int = 3,
-    db: Session = Depends(get_db),
+    lat: float = DEFAULT_TARGET_LAT,
+    lon: float = DEFAULT_TARGET_LON,
+    time: Optional[datetime] = None,
+    target_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get random available satellites"""
-    # Seed satellites if database is empty
-    seed_satellites(db)
-    
-    # Get all active satellites
-    all_satellites = db.query(Satellite).filter(
-        Satellite.is_active == True
-    ).all()
+    """Get the active satellites closest to a ground target at a given time.
+
+    With `target_id`, only satellites inside a precomputed access window of
+    that target at `time` are returned.
+    """
+    if not -90 <= lat <= 90 or not -180 <= lon <= 360:
+        raise HTTPException(status_code=400, detail="Invalid latitude/longitude")
+
+    when = naive_utc(time) if time else datetime.utcnow()
     
-    # Randomly select satellites
-    selected_satellites = random.sample(all_satellites, min(limit, len(all_satellites)))
+    # Active satellites with a slot in the propagated constellation, from the in-memory catalog
+    catalog = satellite_catalog.snapshot()
+    candidates, slots = catalog.ranked, catalog.slots
+    if target_id is not None:
+        await ensure_access_windows()
+        target = await db.get(GroundTarget, target_id)
+        if not target:
+            raise HTTPException(status_code=404, detail="Ground target not found")
+        lat, lon = target.latitude, target.longitude
+        visible_ids = select(AccessWindow.satellite_id).where(
+            AccessWindow.target_id == target_id,
+            AccessWindow.rise_time <= when,
+            AccessWindow.set_time >= when,
+        )
+        visible = set((await db.execute(visible_ids)).scalars())
+        keep = [i for i, sat in enumerate(candidates) if sat.id in visible]
+        candidates, slots = [candidates[i] for i in keep], slots[keep]
+    if not candidates:
+        return []
+
+    # One vectorized pass over the whole constellation, then rank by slant range
+    ranges = CONSTELLATION.slant_ranges(lat, lon, when)[:, 0]
+    order = np.argsort(ranges[slots], kind="stable")[:max(limit, 0)]
     
-    return [SatelliteResponse.model_validate(sat) for sat in selected_satellites]
+    return [candidates[i] for i in order]
 
 @app.post("/bookings", response_model=BookingResponse)
 async def create_booking(
     booking_data: BookingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new booking"""
     # Verify satellite exists and is active
-    satellite = db.query(Satellite).filter(
-        Satellite.id == booking_data.satellite_id,
-        Satellite.is_active == True
-    ).first()
+    satellite = satellite_catalog.get(booking_data.satellite_id)
     
     if not satellite:
         raise HTTPException(status_code=404, detail="Satellite not found or not active")
     
+    scheduled_time = naive_utc(booking_data.scheduled_time) if booking_data.scheduled_time else None
+    if scheduled_time is not None:
+        start = scheduled_time
+        end = start + timedelta(minutes=booking_data.duration or 0)
+        # Fast in-memory pre-check before touching the database
+        if not slot_index.is_free(satellite.id, to_seconds(start), to_seconds(end)):
+            raise HTTPException(status_code=409, detail="Satellite is already booked for an overlapping time slot")
+    
+    # Verify the satellite can actually see the target for the whole slot
+    if booking_data.target_id is not None:
+        await ensure_access_windows()
+        target = await db.get(GroundTarget, booking_data.target_id)
+        if not target:
+            raise HTTPException(status_code=404, detail="Ground target not found")
+        if scheduled_time is not None:
+            if end > datetime.utcnow() + timedelta(hours=ACCESS_HORIZON_HOURS):
+                raise HTTPException(status_code=400, detail="Scheduled time is beyond the access-window horizon")
+            if not await db.run_sync(find_access_window, satellite.id, target.id, start, end):
+                raise HTTPException(status_code=409, detail="Satellite has no access to the target at the scheduled time")
+    
     # Create booking
     booking = Booking(
         user_id=current_user.id,
@@ -368,47 +968,250 @@ async def create_booking(
         object_name=booking_data.object_name,
         object_type=booking_data.object_type,
         booking_type=booking_data.booking_type,
-        scheduled_time=booking_data.scheduled_time,
+        scheduled_time=scheduled_time,
         duration=booking_data.duration,
+        target_id=booking_data.target_id,
+        priority=booking_data.priority,
         notes=booking_data.notes,
         status="pending"
     )
     
+    if scheduled_time is not None:
+        # Re-check against the database under the satellite lock; other workers may have booked it
+        await db.run_sync(lock_satellite_slots, satellite.id)
+        conflict = await db.run_sync(find_slot_conflict, satellite.id, start, end)
+        if conflict:
+            await db.rollback()
+            slot_index.invalidate(booking_data.satellite_id)
+            raise HTTPException(status_code=409, detail="Satellite is already booked for an overlapping time slot")
+    
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
     
-    return BookingResponse.model_validate(booking)
+    if scheduled_time is not None:
+        slot_index.add(satellite.id, to_seconds(start), to_seconds(end), booking.id)
+    
+    # The satellite comes from the catalog; booking.satellite is never loaded
+    fields = {name: getattr(booking, name) for name in BookingResponse.model_fields if name != "satellite"}
+    return BookingResponse(**fields, satellite=satellite)
+
+def encode_booking_cursor(booking: Booking) -> str:
+    raw = f"{booking.created_at.isoformat()}|{booking.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_booking_cursor(cursor: str):
+    try:
+        created_at, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(booking_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @app.get("/bookings", response_model=List[BookingResponse])
 async def get_user_bookings(
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(BOOKINGS_PAGE_DEFAULT_LIMIT, ge=1, le=BOOKINGS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    booking_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all bookings for the current user"""
-    bookings = db.query(Booking).filter(
-        Booking.user_id == current_user.id
-    ).order_by(Booking.created_at.desc()).all()
+    """Get the current user's bookings, newest first, one page at a time.
+
+    When more bookings exist, the `X-Next-Cursor` response header holds the
+    cursor to pass back for the next page.
+    """
+    query = (
+        select(Booking)
+        .options(joinedload(Booking.satellite))
+        .where(Booking.user_id == current_user.id)
+    )
+    if status_filter is not None:
+        query = query.where(Booking.status == status_filter)
+    if booking_type is not None:
+        query = query.where(Booking.booking_type == booking_type)
+    if cursor is not None:
+        # Seek past the last row of the previous page via ix_bookings_user_created
+        query = query.where(tuple_(Booking.created_at, Booking.id) < decode_booking_cursor(cursor))
+    result = await db.execute(
+        query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1)
+    )
+    bookings = result.scalars().all()
+    
+    if len(bookings) > limit:
+        bookings = bookings[:limit]
+        response.headers["X-Next-Cursor"] = encode_booking_cursor(bookings[-1])
     
     return [BookingResponse.model_validate(booking) for booking in bookings]
 
 @app.get("/bookings/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific booking"""
-    booking = db.query(Booking).filter(
-        Booking.id == booking_id,
-        Booking.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Booking)
+        .options(joinedload(Booking.satellite))
+        .where(Booking.id == booking_id, Booking.user_id == current_user.id)
+    )
+    booking = result.scalars().first()
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     return BookingResponse.model_validate(booking)
 
+@app.get("/stats/cache")
+async def get_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters of the in-process caches"""
+    return {"caches": [token_cache.stats(), user_cache.stats(), google_token_cache.stats(), satellite_catalog.stats()]}
+
+@app.post("/tracks/measurements", response_model=MeasurementBatchResponse)
+async def ingest_measurements(
+    batch: MeasurementBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Store a batch of measurements and run one batched Kalman update over all tracks"""
+    allowed = await db.run_sync(owned_track_bookings, current_user.id, [m.booking_id for m in batch.measurements])
+    accepted = [m for m in batch.measurements if m.booking_id in allowed]
+    
+    # Tracks not yet in memory are rebuilt from history before new data is applied
+    for booking_id in {m.booking_id for m in accepted}:
+        if booking_id not in track_bank:
+            await db.run_sync(replay_track, booking_id)
+    
+    if accepted:
+        await db.execute(insert(TrackMeasurement), [
+            {
+                "booking_id": m.booking_id,
+                "measured_at": naive_utc(m.time),
+                **dict(zip(_COORDINATES, m.position)),
+            }
+            for m in accepted
+        ])
+        await db.commit()
+        track_bank.ingest(
+            [m.booking_id for m in accepted],
+            [to_seconds(m.time) for m in accepted],
+            [m.position for m in accepted],
+        )
+    
+    rejected = sorted({m.booking_id for m in batch.measurements} - allowed)
+    return MeasurementBatchResponse(accepted=len(accepted), rejected_booking_ids=rejected)
+
+@app.get("/bookings/{booking_id}/track", response_model=TrackStateResponse)
+async def get_track_state(
+    booking_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the current filtered state and covariance of a track booking"""
+    if not await db.run_sync(owned_track_bookings, current_user.id, [booking_id]):
+        raise HTTPException(status_code=404, detail="Track booking not found")
+    if booking_id not in track_bank and not await db.run_sync(replay_track, booking_id):
+        raise HTTPException(status_code=404, detail="No measurements for this booking yet")
+    
+    t, x, P = track_bank.state(booking_id)
+    return TrackStateResponse(
+        booking_id=booking_id,
+        time=from_seconds(t),
+        state=x.tolist(),
+        covariance=P.tolist(),
+        updates=track_bank.update_count(booking_id),
+    )
+
+@app.post("/tracks/smooth", response_model=List[SmoothedTrackResponse])
+async def smooth_tracks(
+    request: SmoothRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Re-process stored tracks with a batched RTS smoother"""
+    booking_ids = sorted(await db.run_sync(owned_track_bookings, current_user.id, request.booking_ids))
+    measurements = await db.run_sync(load_track_measurements, booking_ids)
+    grouped = {bid: rows for bid, rows in measurements.items() if rows}
+    if not grouped:
+        return []
+    
+    # Pad every track to the longest one so all are smoothed in one pass
+    steps = max(len(rows) for rows in grouped.values())
+    times = np.zeros((len(grouped), steps))
+    z = np.full((len(grouped), steps, TRACK_DIMENSIONS), np.nan)
+    for i, rows in enumerate(grouped.values()):
+        times[i, :len(rows)] = [to_seconds(m.measured_at) for m in rows]
+        times[i, len(rows):] = times[i, len(rows) - 1]
+        z[i, :len(rows)] = [measurement_row_position(m) for m in rows]
+    states, _ = rts_smooth(
+        times, z,
+        dim=TRACK_DIMENSIONS,
+        process_noise=TRACK_PROCESS_NOISE,
+        measurement_noise=TRACK_MEASUREMENT_NOISE,
+    )
+    
+    return [
+        SmoothedTrackResponse(
+            booking_id=bid,
+            points=[
+                SmoothedPoint(time=rows[k].measured_at, state=states[i, k].tolist())
+                for k in range(len(rows))
+            ],
+        )
+        for i, (bid, rows) in enumerate(grouped.items())
+    ]
+
+def run_scheduler_once() -> ScheduleRunResponse:
+    db = SessionLocal()
+    try:
+        return schedule_pending_bookings(db)
+    finally:
+        db.close()
+
+@app.post("/scheduler/run", response_model=ScheduleRunResponse)
+async def run_scheduler(current_user: User = Depends(get_operator_user)):
+    """Assign all pending bookings to satellite time slots; operators only"""
+    # Seconds of NumPy and database work, kept off the event loop
+    return await asyncio.to_thread(run_scheduler_once)
+
+@app.get("/targets", response_model=List[GroundTargetResponse])
+async def get_ground_targets(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all ground targets"""
+    await db.run_sync(seed_ground_targets)
+    targets = (await db.execute(select(GroundTarget))).scalars().all()
+    return [GroundTargetResponse.model_validate(t) for t in targets]
+
+@app.get("/targets/{target_id}/windows", response_model=List[AccessWindowResponse])
+async def get_access_windows(
+    target_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    satellite_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get precomputed access windows of a ground target that overlap [start, end]"""
+    await ensure_access_windows()
+    if not await db.get(GroundTarget, target_id):
+        raise HTTPException(status_code=404, detail="Ground target not found")
+    
+    start = naive_utc(start) if start else datetime.utcnow()
+    end = naive_utc(end) if end else start + timedelta(hours=ACCESS_HORIZON_HOURS)
+    query = select(AccessWindow).where(
+        AccessWindow.target_id == target_id,
+        AccessWindow.rise_time <= end,
+        AccessWindow.set_time >= start,
+    )
+    if satellite_id is not None:
+        query = query.where(AccessWindow.satellite_id == satellite_id)
+    windows = (await db.execute(query.order_by(AccessWindow.rise_time))).scalars().all()
+    
+    return [AccessWindowResponse.model_validate(w) for w in windows]
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Vectorized two-body propagation for the BEACON constellation.
+
+Orbital elements mirror simulations/gmat_orbit_simulation.script: 6 planes of
+4 satellites at 55 deg plus 2 polar planes of 4 satellites, all sharing the
+SatTemplate SMA/ECC/AOP. Every function works on whole arrays so a single call
+covers every (satellite x epoch) state at once.
+"""
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+# Physical constants (km, s)
+MU_EARTH = 398600.4418
+EARTH_RADIUS = 6378.137
+EARTH_FLATTENING = 1 / 298.257223563
+EARTH_ROTATION_RATE = 7.2921150e-5  # rad/s
+
+# GMAT SatTemplate
+CONSTELLATION_EPOCH = datetime(2025, 10, 4, 17, 15, 0)
+TEMPLATE_SMA = 6878.137
+TEMPLATE_ECC = 0.01
+TEMPLATE_AOP = 0.0
+
+# (RAAN, INC) per plane, in satellite order Sat1..Sat32
+CONSTELLATION_PLANES = [
+    (0, 55), (60, 55), (120, 55), (180, 55), (240, 55), (300, 55),
+    (0, 90), (90, 90),
+]
+SATS_PER_PLANE = 4
+PLANE_TRUE_ANOMALIES = [0, 90, 180, 270]
+
+_J2000_JD = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+
+TimeLike = Union[datetime, Sequence[datetime], np.ndarray]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def seconds_since_epoch(times: TimeLike) -> np.ndarray:
+    """Convert datetimes (or seconds already) into seconds since CONSTELLATION_EPOCH"""
+    if isinstance(times, datetime):
+        times = [times]
+    if isinstance(times, np.ndarray) and times.dtype.kind in "fiu":
+        return times.astype(np.float64)
+    return np.array(
+        [(_naive_utc(t) - CONSTELLATION_EPOCH).total_seconds() for t in times],
+        dtype=np.float64,
+    )
+
+
+def gmst(seconds: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal angle (rad) for seconds since CONSTELLATION_EPOCH"""
+    epoch_jd = (
+        (CONSTELLATION_EPOCH - datetime(1970, 1, 1)).total_seconds() / 86400.0
+        + _UNIX_EPOCH_JD
+    )
+    days = epoch_jd + np.asarray(seconds, dtype=np.float64) / 86400.0 - _J2000_JD
+    return np.deg2rad(np.mod(280.46061837 + 360.98564736629 * days, 360.0))
+
+
+def true_to_mean_anomaly(nu: np.ndarray, ecc: np.ndarray) -> np.ndarray:
+    ecc_anom = 2.0 * np.arctan2(
+        np.sqrt(1.0 - ecc) * np.sin(nu / 2.0), np.sqrt(1.0 + ecc) * np.cos(nu / 2.0)
+    )
+    return ecc_anom - ecc * np.sin(ecc_anom)
+
+
+def solve_kepler(mean_anom: np.ndarray, ecc: np.ndarray, tol: float = 1e-12, max_iter: int = 20) -> np.ndarray:
+    """Solve M = E - e sin E for E with Newton iterations over whole arrays"""
+    ecc_anom = mean_anom + ecc * np.sin(mean_anom)
+    for _ in range(max_iter):
+        delta = (ecc_anom - ecc * np.sin(ecc_anom) - mean_anom) / (1.0 - ecc * np.cos(ecc_anom))
+        ecc_anom = ecc_anom - delta
+        if np.max(np.abs(delta), initial=0.0) < tol:
+            break
+    return ecc_anom
+
+
+def geodetic_to_ecef(lat_deg, lon_deg, alt_km=0.0) -> np.ndarray:
+    """WGS84 geodetic coordinates to ECEF (km); output shape is broadcast shape + (3,)"""
+    lat = np.deg2rad(np.asarray(lat_deg, dtype=np.float64))
+    lon = np.deg2rad(np.asarray(lon_deg, dtype=np.float64))
+    alt = np.asarray(alt_km, dtype=np.float64)
+    e2 = EARTH_FLATTENING * (2.0 - EARTH_FLATTENING)
+    n = EARTH_RADIUS / np.sqrt(1.0 - e2 * np.sin(lat) ** 2)
+    x = (n + alt) * np.cos(lat) * np.cos(lon)
+    y = (n + alt) * np.cos(lat) * np.sin(lon)
+    z = (n * (1.0 - e2) + alt) * np.sin(lat)
+    return np.stack(np.broadcast_arrays(x, y, z), axis=-1)
+
+
+def eci_to_ecef(positions: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Rotate (..., n_epochs, 3) inertial positions into the Earth-fixed frame"""
+    theta = gmst(seconds)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    x, y, z = positions[..., 0], positions[..., 1], positions[..., 2]
+    return np.stack((cos_t * x + sin_t * y, -sin_t * x + cos_t * y, z), axis=-1)
+
+
+class Constellation:
+    """Keplerian element set for N satellites, propagated as batched arrays"""
+
+    def __init__(self, sma, ecc, inc_deg, raan_deg, aop_deg, ta_deg, names=None):
+        self.sma = np.asarray(sma, dtype=np.float64)
+        self.ecc = np.asarray(ecc, dtype=np.float64)
+        self.inc = np.deg2rad(np.asarray(inc_deg, dtype=np.float64))
+        self.raan = np.deg2rad(np.asarray(raan_deg, dtype=np.float64))
+        self.aop = np.deg2rad(np.asarray(aop_deg, dtype=np.float64))
+        self.mean_anomaly0 = true_to_mean_anomaly(np.deg2rad(np.asarray(ta_deg, dtype=np.float64)), self.ecc)
+        self.mean_motion = np.sqrt(MU_EARTH / self.sma ** 3)
+        self.names = list(names) if names is not None else [f"Sat{i + 1}" for i in range(len(self.sma))]
+
+        # Perifocal basis vectors P/Q in the inertial frame, one row per satellite
+        cos_o, sin_o = np.cos(self.raan), np.sin(self.raan)
+        cos_w, sin_w = np.cos(self.aop), np.sin(self.aop)
+        cos_i, sin_i = np.cos(self.inc), np.sin(self.inc)
+        self._p = np.stack((
+            cos_o * cos_w - sin_o * sin_w * cos_i,
+            sin_o * cos_w + cos_o * sin_w * cos_i,
+            sin_w * sin_i,
+        ), axis=-1)
+        self._q = np.stack((
+            -cos_o * sin_w - sin_o * cos_w * cos_i,
+            -sin_o * sin_w + cos_o * cos_w * cos_i,
+            cos_w * sin_i,
+        ), axis=-1)
+
+    def __len__(self):
+        return len(self.sma)
+
+    def subset(self, indices: Sequence[int]) -> "Constellation":
+        idx = np.asarray(indices, dtype=np.intp)
+        sub = Constellation.__new__(Constellation)
+        for attr in ("sma", "ecc", "inc", "raan", "aop", "mean_anomaly0", "mean_motion", "_p", "_q"):
+            setattr(sub, attr, getattr(self, attr)[idx])
+        sub.names = [self.names[i] for i in idx]
+        return sub
+
+    def propagate(self, times: TimeLike, with_velocity: bool = False):
+        """Inertial positions (n_sat, n_epochs, 3) in km, plus velocities in km/s if requested"""
+        seconds = seconds_since_epoch(times)
+        mean_anom = self.mean_anomaly0[:, None] + self.mean_motion[:, None] * seconds[None, :]
+        ecc = self.ecc[:, None]
+        sma = self.sma[:, None]
+        ecc_anom = solve_kepler(np.mod(mean_anom, 2.0 * np.pi), ecc)
+        cos_e, sin_e = np.cos(ecc_anom), np.sin(ecc_anom)
+        root = np.sqrt(1.0 - ecc ** 2)
+
+        x_pf = sma * (cos_e - ecc)
+        y_pf = sma * root * sin_e
+        positions = x_pf[..., None] * self._p[:, None, :] + y_pf[..., None] * self._q[:, None, :]
+        if not with_velocity:
+            return positions
+
+        radius = sma * (1.0 - ecc * cos_e)
+        factor = np.sqrt(MU_EARTH * sma) / radius
+        vx_pf = -factor * sin_e
+        vy_pf = factor * root * cos_e
+        velocities = vx_pf[..., None] * self._p[:, None, :] + vy_pf[..., None] * self._q[:, None, :]
+        return positions, velocities
+
+    def propagate_ecef(self, times: TimeLike) -> np.ndarray:
+        """Earth-fixed positions (n_sat, n_epochs, 3) in km"""
+        seconds = seconds_since_epoch(times)
+        return eci_to_ecef(self.propagate(seconds), seconds)
+
+    def slant_ranges(self, lat_deg: float, lon_deg: float, times: TimeLike) -> np.ndarray:
+        """Distance (km) from a ground point to every satellite, shape (n_sat, n_epochs)"""
+        target = geodetic_to_ecef(lat_deg, lon_deg)
+        return np.linalg.norm(self.propagate_ecef(times) - target, axis=-1)
+
+    def nearest(self, lat_deg: float, lon_deg: float, when: datetime, limit: int = 3):
+        """Indices and ranges of the `limit` satellites closest to a ground point"""
+        ranges = self.slant_ranges(lat_deg, lon_deg, when)[:, 0]
+        order = np.argsort(ranges, kind="stable")[:max(limit, 0)]
+        return order, ranges[order]
+
+
+def build_constellation() -> Constellation:
+    """The 32-satellite constellation defined in gmat_orbit_simulation.script"""
+    raan, inc, ta = [], [], []
+    for plane_raan, plane_inc in CONSTELLATION_PLANES:
+        for anomaly in PLANE_TRUE_ANOMALIES:
+            raan.append(plane_raan)
+            inc.append(plane_inc)
+            ta.append(anomaly)
+    count = len(ta)
+    return Constellation(
+        sma=np.full(count, TEMPLATE_SMA),
+        ecc=np.full(count, TEMPLATE_ECC),
+        inc_deg=inc,
+        raan_deg=raan,
+        aop_deg=np.full(count, TEMPLATE_AOP),
+        ta_deg=ta,
+    )
+
+
+def slot_for_designation(designation: str) -> Optional[int]:
+    """Map a designation such as 'AV-001' to its 0-based constellation slot"""
+    try:
+        number = int(designation.rsplit("-", 1)[-1])
+    except (ValueError, AttributeError):
+        return None
+    return number - 1 if number >= 1 else None
+
+
+CONSTELLATION = build_constellation()
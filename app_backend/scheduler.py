@@ -0,0 +1,119 @@
+"""Greedy batch scheduler for pending bookings.
+
+Requests are taken in priority order (highest priority, then soonest) and
+each one is placed in the earliest conflict-free slot on its requested
+satellite, falling back to the other satellites when allowed. Conflict
+checks go through the per-satellite SlotCalendar index, so a run costs
+O(n log n) rather than comparing every booking against every other one.
+"""
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from slots import CalendarSet
+
+
+@dataclass
+class ScheduleRequest:
+    booking_id: int
+    satellite_id: int
+    earliest: float  # seconds
+    duration: float  # seconds
+    priority: int = 0
+    target_id: Optional[int] = None
+
+
+@dataclass
+class Assignment:
+    booking_id: int
+    satellite_id: int
+    start: float
+    duration: float
+
+
+@dataclass
+class ScheduleResult:
+    assignments: List[Assignment] = field(default_factory=list)
+    unassigned: List[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        total = len(self.assignments) + len(self.unassigned)
+        return total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _fit_in_windows(calendar, windows, start, duration, latest):
+    """Earliest free slot that also lies entirely inside one access window"""
+    if not windows:
+        return None
+    rises = [w[0] for w in windows]
+    i = max(bisect_right(rises, start) - 1, 0)
+    for rise, set_ in windows[i:]:
+        if rise > latest:
+            break
+        lo = max(start, rise)
+        if set_ - lo < duration:
+            continue
+        t = calendar.earliest_fit(lo, duration, min(latest, set_ - duration))
+        if t is not None:
+            return t
+    return None
+
+
+def schedule(
+    requests: Sequence[ScheduleRequest],
+    satellite_ids: Sequence[int],
+    calendars: Optional[CalendarSet] = None,
+    windows: Optional[Dict[Tuple[int, int], List[Tuple[float, float]]]] = None,
+    max_delay: float = 86400.0,
+    allow_reassign: bool = True,
+) -> ScheduleResult:
+    """Assign requests to conflict-free satellite slots.
+
+    `calendars` holds slots that are already taken and is updated in place.
+    `windows` maps (satellite_id, target_id) to sorted (rise, set) access
+    windows; requests with a target_id must fit inside one of them.
+    """
+    started = time.perf_counter()
+    calendars = calendars if calendars is not None else CalendarSet()
+    windows = windows or {}
+    result = ScheduleResult()
+
+    ordered = sorted(requests, key=lambda r: (-r.priority, r.earliest, r.booking_id))
+    for request in ordered:
+        latest = request.earliest + max_delay
+        candidates = [request.satellite_id]
+        if allow_reassign:
+            candidates += [s for s in satellite_ids if s != request.satellite_id]
+
+        # Earliest slot wins; the requested satellite wins ties
+        best = None
+        for satellite_id in candidates:
+            calendar = calendars[satellite_id]
+            limit = best[1] if best else latest
+            if request.target_id is None:
+                t = calendar.earliest_fit(request.earliest, request.duration, limit)
+            else:
+                t = _fit_in_windows(
+                    calendar,
+                    windows.get((satellite_id, request.target_id)),
+                    request.earliest,
+                    request.duration,
+                    limit,
+                )
+            if t is not None and (best is None or t < best[1]):
+                best = (satellite_id, t)
+                if t == request.earliest:
+                    break
+
+        if best is None:
+            result.unassigned.append(request.booking_id)
+            continue
+        satellite_id, start = best
+        calendars[satellite_id].add(start, start + request.duration, request.booking_id)
+        result.assignments.append(Assignment(request.booking_id, satellite_id, start, request.duration))
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,176 @@
+"""Per-satellite calendars of booked time slots.
+
+Each calendar keeps its slots sorted by start time, plus the union of those
+slots as disjoint busy blocks. Overlap checks and "earliest free slot"
+searches are binary searches over the blocks instead of a pass over every
+booking, and stay cheap as a calendar grows to many thousands of slots.
+Times are plain float seconds.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def to_seconds(value: datetime) -> float:
+    """Naive-UTC (or aware) datetime to float seconds since the Unix epoch"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _UNIX_EPOCH).total_seconds()
+
+
+class SlotCalendar:
+    """Sorted interval index for one satellite"""
+
+    def __init__(self):
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._ids: List[Optional[int]] = []
+        # Union of all slots as disjoint, sorted [start, end) blocks
+        self._block_starts: List[float] = []
+        self._block_ends: List[float] = []
+        # Longest slot seen; bounds how far back an overlapping slot can start
+        self._max_length = 0.0
+
+    def __len__(self):
+        return len(self._starts)
+
+    def is_free(self, start: float, end: float) -> bool:
+        j = bisect_right(self._block_starts, start) - 1
+        if j >= 0 and self._block_ends[j] > start:
+            return False
+        return j + 1 >= len(self._block_starts) or self._block_starts[j + 1] >= end
+
+    def conflicts(self, start: float, end: float) -> List[Tuple[float, float, Optional[int]]]:
+        """All stored slots overlapping [start, end)"""
+        if self.is_free(start, end):
+            return []
+        found = []
+        i = bisect_left(self._starts, end) - 1
+        horizon = start - self._max_length
+        while i >= 0 and self._starts[i] >= horizon:
+            if self._ends[i] > start:
+                found.append((self._starts[i], self._ends[i], self._ids[i]))
+            i -= 1
+        return found
+
+    def earliest_fit(self, start: float, duration: float, latest: float) -> Optional[float]:
+        """Earliest t in [start, latest] such that [t, t + duration) is free"""
+        t = start
+        j = bisect_right(self._block_starts, t) - 1
+        if j >= 0 and self._block_ends[j] > t:
+            t = self._block_ends[j]
+        j += 1
+        while t <= latest:
+            if j >= len(self._block_starts) or self._block_starts[j] - t >= duration:
+                return t
+            t = self._block_ends[j]
+            j += 1
+        return None
+
+    def add(self, start: float, end: float, slot_id: Optional[int] = None):
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._ids.insert(i, slot_id)
+        self._max_length = max(self._max_length, end - start)
+        self._merge_block(start, end)
+
+    def remove(self, start: float, slot_id: Optional[int]) -> bool:
+        i = bisect_left(self._starts, start)
+        while i < len(self._starts) and self._starts[i] == start:
+            if self._ids[i] == slot_id:
+                del self._starts[i], self._ends[i], self._ids[i]
+                self._rebuild_block(start)
+                return True
+            i += 1
+        return False
+
+    def _merge_block(self, start: float, end: float):
+        lo = bisect_left(self._block_ends, start)
+        hi = bisect_right(self._block_starts, end)
+        if lo < hi:
+            start = min(start, self._block_starts[lo])
+            end = max(end, self._block_ends[hi - 1])
+        self._block_starts[lo:hi] = [start]
+        self._block_ends[lo:hi] = [end]
+
+    def _rebuild_block(self, point: float):
+        """Re-derive the busy block that contained `point` after a slot was removed"""
+        j = bisect_right(self._block_starts, point) - 1
+        block_start, block_end = self._block_starts[j], self._block_ends[j]
+        lo = bisect_left(self._starts, block_start)
+        hi = bisect_right(self._starts, block_end)
+        starts, ends = [], []
+        for s, e in zip(self._starts[lo:hi], self._ends[lo:hi]):
+            if starts and s <= ends[-1]:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+        self._block_starts[j:j + 1] = starts
+        self._block_ends[j:j + 1] = ends
+
+
+class CalendarSet:
+    """SlotCalendar per satellite id"""
+
+    def __init__(self):
+        self.calendars: Dict[int, SlotCalendar] = {}
+
+    def __getitem__(self, satellite_id: int) -> SlotCalendar:
+        calendar = self.calendars.get(satellite_id)
+        if calendar is None:
+            calendar = self.calendars[satellite_id] = SlotCalendar()
+        return calendar
+
+    def load(self, slots: Iterable[Tuple[int, float, float, Optional[int]]]):
+        """Bulk-load (satellite_id, start, end, slot_id) rows"""
+        for satellite_id, start, end, slot_id in sorted(slots, key=lambda s: (s[0], s[1])):
+            self[satellite_id].add(start, end, slot_id)
+
+
+class SatelliteSlotIndex:
+    """Process-wide, lazily loaded SlotCalendar per satellite.
+
+    `loader(satellite_id)` returns the (start, end, slot_id) rows of one
+    satellite and is called the first time that satellite is used. The index
+    is a fast pre-check only; the database stays the source of truth.
+    """
+
+    def __init__(self, loader: Callable[[int], Iterable[Tuple[float, float, Optional[int]]]]):
+        self._loader = loader
+        self._calendars: Dict[int, SlotCalendar] = {}
+        self._lock = threading.RLock()
+
+    def _calendar(self, satellite_id: int) -> SlotCalendar:
+        calendar = self._calendars.get(satellite_id)
+        if calendar is None:
+            calendar = SlotCalendar()
+            for start, end, slot_id in sorted(self._loader(satellite_id)):
+                calendar.add(start, end, slot_id)
+            self._calendars[satellite_id] = calendar
+        return calendar
+
+    def is_free(self, satellite_id: int, start: float, end: float) -> bool:
+        with self._lock:
+            return self._calendar(satellite_id).is_free(start, end)
+
+    def add(self, satellite_id: int, start: float, end: float, slot_id: Optional[int] = None):
+        with self._lock:
+            self._calendar(satellite_id).add(start, end, slot_id)
+
+    def remove(self, satellite_id: int, start: float, slot_id: Optional[int]) -> bool:
+        with self._lock:
+            calendar = self._calendars.get(satellite_id)
+            return calendar.remove(start, slot_id) if calendar is not None else False
+
+    def invalidate(self, satellite_id: Optional[int] = None):
+        """Drop cached calendars so they are reloaded from the database on next use"""
+        with self._lock:
+            if satellite_id is None:
+                self._calendars.clear()
+            else:
+                self._calendars.pop(satellite_id, None)
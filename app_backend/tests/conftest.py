@@ -0,0 +1,51 @@
+"""Shared fixtures: the backend on a throwaway SQLite database, and signed-in users.
+
+Run from app_backend/:  python -m pytest tests
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+import pytest
+
+_workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_workdir, "test.db")
+os.environ["OPERATOR_EMAILS"] = "operator@test.example"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_emails = (f"user{n}@test.example" for n in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def backend():
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def client(backend):
+    from fastapi.testclient import TestClient
+
+    with TestClient(backend.app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(backend, client):
+    """Create a user and return (user id, auth headers)"""
+    def make(email=None):
+        email = email or next(_emails)
+        db = backend.SessionLocal()
+        try:
+            user = backend.User(email=email, full_name="Test User", is_profile_complete=True)
+            db.add(user)
+            db.commit()
+            user_id = user.id
+        finally:
+            db.close()
+        token = backend.create_access_token({"user_id": user_id, "email": email})
+        return user_id, {"Authorization": f"Bearer {token}"}
+
+    return make
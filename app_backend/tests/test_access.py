@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import access
+from access import AccessTarget, compute_windows, elevations
+from orbit import CONSTELLATION, CONSTELLATION_EPOCH
+
+START = datetime(2025, 10, 5)
+TARGETS = [AccessTarget(27.700769, 85.300140, 10.0), AccessTarget(-33.9, 18.4, 5.0)]
+
+
+def offset(when: datetime) -> float:
+    return (when - CONSTELLATION_EPOCH).total_seconds()
+
+
+def elevation_at(window, when: datetime) -> float:
+    return elevations(CONSTELLATION.subset([window.sat_index]), [TARGETS[window.target_index]],
+                      np.array([offset(when)]))[0, 0, 0]
+
+
+@pytest.fixture(scope="module")
+def windows():
+    return compute_windows(CONSTELLATION, TARGETS, START, START + timedelta(hours=6), 10.0)
+
+
+def test_windows_open_and_close_at_the_minimum_elevation(windows):
+    assert windows
+    for w in windows:
+        threshold = TARGETS[w.target_index].min_elevation
+        assert w.rise_time < w.set_time
+        if w.rise_time > START:
+            assert elevation_at(w, w.rise_time) == pytest.approx(threshold, abs=0.05)
+        if w.set_time < START + timedelta(hours=6):
+            assert elevation_at(w, w.set_time) == pytest.approx(threshold, abs=0.05)
+        assert elevation_at(w, w.rise_time + (w.set_time - w.rise_time) / 2) > threshold
+        assert threshold < w.max_elevation <= 90.0
+
+
+def test_windows_cover_exactly_the_visible_samples(windows):
+    seconds = offset(START) + np.arange(0.0, 6 * 3600.0, 1.0)
+    elev = elevations(CONSTELLATION, TARGETS, seconds)
+    thresholds = np.array([t.min_elevation for t in TARGETS])[None, :, None]
+    visible = elev >= thresholds
+
+    covered = np.zeros_like(visible)
+    near_edge = np.zeros_like(visible)
+    for w in windows:
+        rise, set_ = offset(w.rise_time), offset(w.set_time)
+        covered[w.sat_index, w.target_index] |= (seconds >= rise) & (seconds <= set_)
+        for edge in (rise, set_):
+            near_edge[w.sat_index, w.target_index] |= np.abs(seconds - edge) < 2.0
+    # Crossings are interpolated between 10 s samples, so only the seconds around them may differ
+    assert not np.any((visible != covered) & ~near_edge)
+
+
+def test_peak_elevation_matches_dense_sampling(windows):
+    for w in windows[:10]:
+        span = (w.set_time - w.rise_time).total_seconds()
+        seconds = offset(w.rise_time) + np.linspace(0.0, span, 200)
+        dense = elevations(CONSTELLATION.subset([w.sat_index]), [TARGETS[w.target_index]], seconds).max()
+        assert w.max_elevation == pytest.approx(dense, abs=0.5)
+
+
+def test_chunking_does_not_change_the_windows(windows, monkeypatch):
+    # 64 epochs per chunk, so many passes span a chunk boundary
+    monkeypatch.setattr(access, "MAX_SAMPLES_PER_CHUNK", len(CONSTELLATION) * len(TARGETS) * 64)
+    chunked = compute_windows(CONSTELLATION, TARGETS, START, START + timedelta(hours=6), 10.0)
+    assert [(w.sat_index, w.target_index) for w in chunked] == [(w.sat_index, w.target_index) for w in windows]
+    for a, b in zip(chunked, windows):
+        assert abs((a.rise_time - b.rise_time).total_seconds()) < 1e-3
+        assert abs((a.set_time - b.set_time).total_seconds()) < 1e-3
+        assert a.max_elevation == pytest.approx(b.max_elevation)
+
+
+def test_passes_in_progress_are_clipped_to_the_span(windows):
+    w = next(w for w in windows if w.rise_time > START and w.set_time < START + timedelta(hours=6))
+    middle = w.rise_time + (w.set_time - w.rise_time) / 2
+    clipped = compute_windows(CONSTELLATION, TARGETS, middle, w.set_time - timedelta(seconds=30), 10.0)
+    ongoing = [c for c in clipped if (c.sat_index, c.target_index) == (w.sat_index, w.target_index)]
+    assert len(ongoing) == 1
+    assert ongoing[0].rise_time == middle
+    assert ongoing[0].set_time == w.set_time - timedelta(seconds=30)
+
+
+def test_empty_inputs():
+    assert compute_windows(CONSTELLATION, TARGETS, START, START) == []
+    assert compute_windows(CONSTELLATION, [], START, START + timedelta(hours=1)) == []
+    assert compute_windows(CONSTELLATION.subset([]), TARGETS, START, START + timedelta(hours=1)) == []
+
+
+def test_bookings_on_a_target_must_fall_inside_an_access_window(backend, client, make_user):
+    _, headers = make_user()
+    db = backend.SessionLocal()
+    try:
+        backend.seed_satellites(db)
+    finally:
+        db.close()
+    (target,) = [t for t in client.get("/targets", headers=headers).json() if t["name"] == "Kathmandu"]
+    assert client.get("/targets/999/windows", headers=headers).status_code == 404
+
+    windows = client.get(f"/targets/{target['id']}/windows", headers=headers).json()
+    window = next(w for w in windows if datetime.fromisoformat(w["rise_time"]) > datetime.utcnow()
+                  and datetime.fromisoformat(w["set_time"]) - datetime.fromisoformat(w["rise_time"]) > timedelta(minutes=3))
+    rise, set_ = datetime.fromisoformat(window["rise_time"]), datetime.fromisoformat(window["set_time"])
+
+    def book(start):
+        return client.post("/bookings", headers=headers, json={
+            "object_name": "relay", "object_type": "satellite", "booking_type": "track",
+            "satellite_id": window["satellite_id"], "target_id": target["id"],
+            "scheduled_time": start.isoformat(), "duration": 1,
+        })
+
+    assert book(rise + timedelta(seconds=30)).status_code == 200
+    assert book(set_ + timedelta(seconds=30)).status_code == 409
+    assert book(datetime.utcnow() + timedelta(days=30)).status_code == 400
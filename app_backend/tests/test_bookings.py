@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+
+def booking(satellite_id, start, duration=10, **fields):
+    return {"object_name": "object", "object_type": "star", "booking_type": "track", "satellite_id": satellite_id,
+            "scheduled_time": start.isoformat(), "duration": duration, **fields}
+
+
+def test_overlapping_slots_are_rejected_with_409(backend, client, make_user):
+    _, headers = make_user()
+    db = backend.SessionLocal()
+    try:
+        backend.seed_satellites(db)
+    finally:
+        db.close()
+    start = (datetime.utcnow() + timedelta(days=700)).replace(microsecond=0)
+
+    assert client.post("/bookings", headers=headers, json=booking(7, start)).status_code == 200
+    response = client.post("/bookings", headers=headers, json=booking(7, start + timedelta(minutes=5)))
+    assert response.status_code == 409
+    # Back to back is not an overlap, and other satellites are unaffected
+    assert client.post("/bookings", headers=headers, json=booking(7, start + timedelta(minutes=10))).status_code == 200
+    assert client.post("/bookings", headers=headers, json=booking(8, start)).status_code == 200
+
+
+def test_database_check_catches_slots_the_index_has_not_seen(backend, client, make_user):
+    user_id, headers = make_user()
+    start = (datetime.utcnow() + timedelta(days=710)).replace(microsecond=0)
+    assert client.post("/bookings", headers=headers, json=booking(9, start)).status_code == 200
+
+    # Written by another process: this process's index still has the satellite's old calendar
+    db = backend.SessionLocal()
+    try:
+        db.add(backend.Booking(user_id=user_id, satellite_id=9, object_name="other", object_type="star",
+                               booking_type="track", status="pending",
+                               scheduled_time=start + timedelta(hours=1), duration=10))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/bookings", headers=headers, json=booking(9, start + timedelta(minutes=65)))
+    assert response.status_code == 409
+    # The index was reloaded, so the next attempt is refused before the insert transaction
+    assert not backend.slot_index.is_free(9, backend.to_seconds(start + timedelta(minutes=65)),
+                                          backend.to_seconds(start + timedelta(minutes=66)))
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+
+import cache
+from cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    store = TTLCache("test", ttl=10.0)
+    store.set("a", 1)
+    store.set("b", 2, ttl=3.0)
+    store.set("c", 3, ttl=60.0)  # capped at the cache's ttl
+    store.set("d", 4, ttl=0.0)  # already expired: not stored
+    clock[0] += 5.0
+    assert (store.get("a"), store.get("b"), store.get("c"), store.get("d", "gone")) == (1, None, 3, "gone")
+    clock[0] += 5.0
+    assert store.get("a") is None and store.get("c") is None
+    assert store.stats()["hits"] == 2 and store.stats()["misses"] == 4
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    store = TTLCache("test", max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert (store.get("a"), store.get("c")) == (1, 3)
+    assert store.stats()["evictions"] == 1
+    assert store.invalidate("a") and not store.invalidate("a")
+    assert len(store) == 1
+
+
+def test_profile_updates_are_seen_through_the_user_cache(client, make_user):
+    _, headers = make_user()
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Test User"
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Test User"  # served from the cache
+
+    response = client.put("/user/profile", headers=headers, json={"full_name": "Renamed", "mobile_no": "+977 1234"})
+    assert response.status_code == 200, response.text
+    me = client.get("/auth/me", headers=headers).json()
+    assert (me["full_name"], me["mobile_no"]) == ("Renamed", "+977 1234")
+
+
+def test_bad_tokens_are_rejected_and_not_cached(backend, client, make_user):
+    user_id, _ = make_user()
+    expired = jwt.encode({"user_id": user_id, "exp": datetime.utcnow() - timedelta(minutes=1)},
+                         backend.SECRET_KEY, algorithm=backend.ALGORITHM)
+    forged = jwt.encode({"user_id": user_id}, "not-the-secret", algorithm=backend.ALGORITHM)
+    for token, detail in ((expired, "Token has expired"), (forged, "Invalid token"), ("garbage", "Invalid token")):
+        response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert (response.status_code, response.json()["detail"]) == (401, detail)
+        assert backend.token_cache.get(token) is None
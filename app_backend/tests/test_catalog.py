@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import catalog as catalog_module
+from catalog import SatelliteCatalog
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(catalog_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def satellites(*active):
+    return [SimpleNamespace(id=n + 1, designation=f"SAT-{n + 1:03d}", is_active=is_active)
+            for n, is_active in enumerate(active)]
+
+
+def test_snapshot_loads_once_until_invalidated(clock):
+    records = satellites(True, False, True)
+    catalog = SatelliteCatalog(lambda: records, max_age=60)
+
+    first = catalog.snapshot()
+    assert catalog.snapshot() is first and catalog.loads == 1
+    assert first.active_ids == [1, 3]
+    assert catalog.get(2) is None and catalog.get(2, active_only=False).id == 2
+
+    catalog.invalidate()
+    assert catalog.snapshot() is not first and catalog.loads == 2
+
+
+def test_snapshot_expires_after_max_age(clock):
+    catalog = SatelliteCatalog(lambda: satellites(True), max_age=60)
+    catalog.snapshot()
+    clock[0] += 59
+    catalog.snapshot()
+    assert catalog.loads == 1
+    clock[0] += 2
+    catalog.snapshot()
+    assert catalog.loads == 2
+
+
+def test_write_during_load_forces_another_load(clock):
+    catalog = None
+
+    def loader():
+        if catalog.loads == 0:
+            # What invalidate() does from another thread once the write commits
+            catalog.version += 1
+        return satellites(True)
+
+    catalog = SatelliteCatalog(loader, max_age=60)
+    catalog.snapshot()
+    catalog.snapshot()
+    assert catalog.loads == 2
+
+
+def test_orm_writes_invalidate_the_catalog(backend, client, make_user):
+    _, headers = make_user()
+    start = (datetime.utcnow() + timedelta(days=720)).replace(microsecond=0)
+    body = {"object_name": "object", "object_type": "star", "booking_type": "track", "satellite_id": 11,
+            "scheduled_time": start.isoformat(), "duration": 10}
+    assert client.post("/bookings", headers=headers, json=body).status_code == 200
+
+    db = backend.SessionLocal()
+    try:
+        db.get(backend.Satellite, 11).is_active = False
+        db.commit()
+        body["scheduled_time"] = (start + timedelta(hours=1)).isoformat()
+        assert client.post("/bookings", headers=headers, json=body).status_code == 404
+    finally:
+        db.get(backend.Satellite, 11).is_active = True
+        db.commit()
+        db.close()
+    assert client.post("/bookings", headers=headers, json=body).status_code == 200
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def google(backend, monkeypatch):
+    """Stand-in for the Google APIs; answers only once tokeninfo and userinfo are both in flight"""
+    calls = []
+    in_flight = {}
+
+    async def handler(request):
+        token = request.url.params.get("access_token") or request.headers["Authorization"].split()[1]
+        calls.append((request.url.path, token))
+        arrived = in_flight.setdefault(token, asyncio.Event())
+        if len([c for c in calls if c[1] == token]) % 2 == 1:
+            await asyncio.wait_for(arrived.wait(), timeout=2.0)
+        else:
+            arrived.set()
+        if token.startswith("bad"):
+            return httpx.Response(400, json={"error": "invalid_token"})
+        if request.url.path == "/oauth2/v3/tokeninfo":
+            return httpx.Response(200, json={"expires_in": "3599"})
+        return httpx.Response(200, json={"id": f"g-{token}", "email": f"{token}@gmail.test", "name": "Google User"})
+
+    client = httpx.AsyncClient(base_url="https://google.test", transport=httpx.MockTransport(handler))
+    monkeypatch.setitem(backend.http_clients, "google", client)
+    return calls
+
+
+def test_google_login_verifies_both_endpoints_concurrently(client, google):
+    response = client.post("/auth/google", json={"token": "alice"})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["user"]["email"] == "alice@gmail.test"
+    assert sorted(path for path, _ in google) == ["/oauth2/v2/userinfo", "/oauth2/v3/tokeninfo"]
+
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {body['access_token']}"}).json()
+    assert me["id"] == body["user"]["id"]
+
+
+def test_verified_tokens_are_cached(client, google):
+    first = client.post("/auth/google", json={"token": "bob"}).json()
+    second = client.post("/auth/google", json={"token": "bob"}).json()
+    assert first["user"]["id"] == second["user"]["id"]
+    assert len(google) == 2
+
+
+def test_invalid_google_token_is_401(client, google):
+    response = client.post("/auth/google", json={"token": "bad-token"})
+    assert response.status_code == 401
+    client.post("/auth/google", json={"token": "bad-token"})
+    assert len(google) == 4  # failures are not cached
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from orbit import (
+    CONSTELLATION, CONSTELLATION_EPOCH, EARTH_RADIUS, MU_EARTH, TEMPLATE_ECC, TEMPLATE_SMA, eci_to_ecef,
+    geodetic_to_ecef, gmst, seconds_since_epoch, slot_for_designation, solve_kepler,
+)
+
+SIDEREAL_DAY = 86164.0905  # s
+
+
+def test_solve_kepler_satisfies_keplers_equation():
+    mean_anom = np.linspace(0.0, 2.0 * np.pi, 1001)
+    for ecc in (0.0, 0.01, 0.3, 0.9):
+        ecc_anom = solve_kepler(mean_anom, np.full_like(mean_anom, ecc))
+        np.testing.assert_allclose(ecc_anom - ecc * np.sin(ecc_anom), mean_anom, atol=1e-10)
+
+
+def test_epoch_state_starts_at_perigee_for_zero_true_anomaly():
+    positions = CONSTELLATION.propagate(CONSTELLATION_EPOCH)[:, 0]
+    radius = np.linalg.norm(positions, axis=-1)
+    # Satellites 0, 4, 8, ... have true anomaly 0 (perigee), 2, 6, ... 180 deg (apogee)
+    np.testing.assert_allclose(radius[0::4], TEMPLATE_SMA * (1 - TEMPLATE_ECC))
+    np.testing.assert_allclose(radius[2::4], TEMPLATE_SMA * (1 + TEMPLATE_ECC))
+
+
+def test_orbits_repeat_after_one_period():
+    period = 2.0 * np.pi * np.sqrt(TEMPLATE_SMA ** 3 / MU_EARTH)
+    positions = CONSTELLATION.propagate(np.array([1234.0, 1234.0 + period]))
+    np.testing.assert_allclose(positions[:, 0], positions[:, 1], atol=1e-6)
+
+
+def test_energy_and_angular_momentum_are_conserved():
+    seconds = np.linspace(0.0, 86400.0, 97)
+    r, v = CONSTELLATION.propagate(seconds, with_velocity=True)
+    energy = 0.5 * np.sum(v * v, axis=-1) - MU_EARTH / np.linalg.norm(r, axis=-1)
+    np.testing.assert_allclose(energy, -MU_EARTH / (2.0 * TEMPLATE_SMA), rtol=1e-10)
+
+    h = np.cross(r, v)
+    np.testing.assert_allclose(h, np.broadcast_to(h[:, :1], h.shape), rtol=1e-9, atol=1e-6)
+    inclination = np.degrees(np.arccos(h[:, 0, 2] / np.linalg.norm(h[:, 0], axis=-1)))
+    np.testing.assert_allclose(inclination, np.degrees(CONSTELLATION.inc), atol=1e-9)
+
+
+def test_velocity_is_the_derivative_of_position():
+    dt = 0.01
+    r, v = CONSTELLATION.propagate(np.array([500.0 - dt, 500.0, 500.0 + dt]), with_velocity=True)
+    np.testing.assert_allclose((r[:, 2] - r[:, 0]) / (2 * dt), v[:, 1], atol=1e-6)
+
+
+def test_gmst_at_j2000_and_over_a_sidereal_day():
+    j2000 = seconds_since_epoch(datetime(2000, 1, 1, 12))
+    assert np.degrees(gmst(j2000))[0] == pytest.approx(280.46061837, abs=1e-8)
+
+    start = seconds_since_epoch(datetime(2025, 6, 1))
+    turn = np.mod(gmst(start + SIDEREAL_DAY) - gmst(start), 2.0 * np.pi)
+    assert min(turn[0], 2.0 * np.pi - turn[0]) < 1e-6
+
+
+def test_seconds_since_epoch_accepts_aware_datetimes_and_seconds():
+    from datetime import timezone
+
+    aware = (CONSTELLATION_EPOCH + timedelta(hours=1)).replace(tzinfo=timezone.utc)
+    np.testing.assert_allclose(seconds_since_epoch(aware), [3600.0])
+    np.testing.assert_allclose(seconds_since_epoch(np.array([1, 2])), [1.0, 2.0])
+
+
+def test_earth_fixed_frame_rotates_about_the_pole():
+    positions = CONSTELLATION.propagate(np.array([0.0, 5000.0]))
+    fixed = eci_to_ecef(positions, np.array([0.0, 5000.0]))
+    np.testing.assert_allclose(np.linalg.norm(fixed, axis=-1), np.linalg.norm(positions, axis=-1))
+    np.testing.assert_allclose(fixed[..., 2], positions[..., 2])
+
+
+def test_geodetic_to_ecef_on_the_wgs84_ellipsoid():
+    np.testing.assert_allclose(geodetic_to_ecef(0.0, 0.0), [EARTH_RADIUS, 0.0, 0.0])
+    np.testing.assert_allclose(geodetic_to_ecef(0.0, 90.0, 100.0), [0.0, EARTH_RADIUS + 100.0, 0.0], atol=1e-9)
+    np.testing.assert_allclose(geodetic_to_ecef(90.0, 0.0), [0.0, 0.0, 6356.752314245], atol=1e-6)
+
+
+def test_nearest_picks_the_satellite_overhead():
+    when = CONSTELLATION_EPOCH + timedelta(minutes=37)
+    below = CONSTELLATION.propagate_ecef(when)[5, 0]
+    lat = np.degrees(np.arcsin(below[2] / np.linalg.norm(below)))
+    lon = np.degrees(np.arctan2(below[1], below[0]))
+
+    order, ranges = CONSTELLATION.nearest(lat, lon, when, limit=3)
+    assert order[0] == 5
+    altitude = np.linalg.norm(below) - np.linalg.norm(geodetic_to_ecef(lat, lon))
+    assert ranges[0] == pytest.approx(altitude, abs=1.0)
+    assert list(ranges) == sorted(ranges)
+    assert len(CONSTELLATION.nearest(lat, lon, when, limit=0)[0]) == 0
+
+
+def test_slot_for_designation():
+    assert slot_for_designation("AV-001") == 0
+    assert slot_for_designation("AV-032") == 31
+    assert slot_for_designation("AV-000") is None
+    assert slot_for_designation("custom") is None
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+import numpy as np
+
+from orbit import CONSTELLATION, CONSTELLATION_EPOCH, slot_for_designation
+
+
+def test_nearest_satellites_are_ranked_by_slant_range(client, make_user):
+    _, headers = make_user()
+    when = CONSTELLATION_EPOCH + timedelta(hours=5)
+    params = {"lat": -33.9, "lon": 18.4, "time": when.isoformat(), "limit": 5}
+    response = client.get("/satellites/nearest", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+
+    ranges = CONSTELLATION.slant_ranges(-33.9, 18.4, when)[:, 0]
+    slots = [slot_for_designation(s["designation"]) for s in response.json()]
+    assert slots == list(np.argsort(ranges)[:5])
+
+
+def test_nearest_satellites_validates_the_target(client, make_user):
+    _, headers = make_user()
+    assert client.get("/satellites/nearest", headers=headers, params={"lat": 91}).status_code == 400
+    assert client.get("/satellites/nearest", headers=headers, params={"limit": 0}).json() == []
+    assert client.get("/satellites/nearest").status_code == 403
@@ -0,0 +1,131 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from scheduler import ScheduleRequest, schedule
+from slots import CalendarSet
+
+SATELLITES = [1, 2, 3, 4]
+
+
+def random_requests(seed, count=400):
+    rng = random.Random(seed)
+    return [
+        ScheduleRequest(booking_id=i, satellite_id=rng.choice(SATELLITES), earliest=rng.uniform(0, 20_000),
+                        duration=rng.choice([60.0, 300.0, 900.0]), priority=rng.randrange(3))
+        for i in range(count)
+    ]
+
+
+def assert_no_overlaps(intervals):
+    by_satellite = {}
+    for satellite_id, start, end in intervals:
+        by_satellite.setdefault(satellite_id, []).append((start, end))
+    for slots in by_satellite.values():
+        slots.sort()
+        for (_, end), (start, _) in zip(slots, slots[1:]):
+            assert end <= start
+
+
+@pytest.mark.parametrize("allow_reassign", [True, False])
+def test_assignments_are_conflict_free_and_within_the_delay(allow_reassign):
+    requests = random_requests(0)
+    taken = [(1, 1000.0, 5000.0), (3, 0.0, 3000.0)]
+    calendars = CalendarSet()
+    calendars.load((satellite_id, start, end, None) for satellite_id, start, end in taken)
+
+    result = schedule(requests, SATELLITES, calendars, max_delay=3600.0, allow_reassign=allow_reassign)
+
+    by_id = {r.booking_id: r for r in requests}
+    assert sorted([a.booking_id for a in result.assignments] + result.unassigned) == sorted(by_id)
+    for a in result.assignments:
+        request = by_id[a.booking_id]
+        assert request.earliest <= a.start <= request.earliest + 3600.0
+        assert a.duration == request.duration
+        if not allow_reassign:
+            assert a.satellite_id == request.satellite_id
+    assert_no_overlaps(taken + [(a.satellite_id, a.start, a.start + a.duration) for a in result.assignments])
+    # The calendars now hold the new assignments too
+    assert sum(len(c) for c in calendars.calendars.values()) == len(taken) + len(result.assignments)
+
+
+def test_higher_priority_gets_the_contested_slot():
+    requests = [
+        ScheduleRequest(booking_id=1, satellite_id=1, earliest=0.0, duration=100.0, priority=0),
+        ScheduleRequest(booking_id=2, satellite_id=1, earliest=0.0, duration=100.0, priority=2),
+    ]
+    result = schedule(requests, [1], allow_reassign=False)
+    starts = {a.booking_id: a.start for a in result.assignments}
+    assert starts == {2: 0.0, 1: 100.0}
+
+
+def test_reassigns_to_another_satellite_only_when_earlier():
+    calendars = CalendarSet()
+    calendars[1].add(0.0, 500.0)
+    request = ScheduleRequest(booking_id=1, satellite_id=1, earliest=0.0, duration=100.0)
+
+    moved = schedule([request], [1, 2], CalendarSet(), allow_reassign=True)
+    assert (moved.assignments[0].satellite_id, moved.assignments[0].start) == (1, 0.0)
+
+    moved = schedule([request], [1, 2], calendars, allow_reassign=True)
+    assert (moved.assignments[0].satellite_id, moved.assignments[0].start) == (2, 0.0)
+
+
+def test_unassigned_when_nothing_fits_before_the_deadline():
+    calendars = CalendarSet()
+    calendars[1].add(0.0, 10_000.0)
+    request = ScheduleRequest(booking_id=7, satellite_id=1, earliest=0.0, duration=60.0)
+    result = schedule([request], [1], calendars, max_delay=3600.0, allow_reassign=False)
+    assert result.assignments == []
+    assert result.unassigned == [7]
+
+
+def test_target_requests_fit_inside_an_access_window():
+    windows = {(1, 9): [(100.0, 150.0), (400.0, 700.0)], (2, 9): [(300.0, 500.0)]}
+    requests = [
+        ScheduleRequest(booking_id=i, satellite_id=1, earliest=0.0, duration=120.0, target_id=9)
+        for i in range(4)
+    ]
+    result = schedule(requests, [1, 2], windows=windows)
+    placed = {(a.satellite_id, a.start) for a in result.assignments}
+    # The first window is too short; the rest are filled back to back
+    assert placed == {(2, 300.0), (1, 400.0), (1, 520.0)}
+    assert result.unassigned == [3]
+    for a in result.assignments:
+        assert any(rise <= a.start and a.start + a.duration <= set_ for rise, set_ in windows[(a.satellite_id, 9)])
+
+
+def test_scheduler_route_is_for_operators_only(backend, client, make_user):
+    _, headers = make_user()
+    assert client.post("/scheduler/run", headers=headers).status_code == 403
+
+    user_id, headers = make_user()
+    _, operator = make_user("operator@test.example")
+    later = (datetime.utcnow() + timedelta(days=400)).replace(microsecond=0)
+    db = backend.SessionLocal()
+    try:
+        bookings = [
+            backend.Booking(user_id=user_id, satellite_id=1, object_name=f"star-{i}", object_type="star",
+                            booking_type="photograph", status="pending", scheduled_time=later, duration=5)
+            for i in range(3)
+        ]
+        db.add_all(bookings)
+        db.commit()
+        ids = [b.id for b in bookings]
+    finally:
+        db.close()
+
+    response = client.post("/scheduler/run", headers=operator)
+    assert response.status_code == 200, response.text
+
+    db = backend.SessionLocal()
+    try:
+        rows = db.query(backend.Booking).filter(backend.Booking.id.in_(ids)).all()
+        assert {b.status for b in rows} == {"scheduled"}
+        assert_no_overlaps([
+            (b.satellite_id, b.scheduled_time, b.scheduled_time + timedelta(minutes=b.duration)) for b in rows
+        ])
+        assert min(b.scheduled_time for b in rows) >= later
+    finally:
+        db.close()
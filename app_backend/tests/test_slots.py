@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from slots import CalendarSet, SatelliteSlotIndex, SlotCalendar
+
+
+class NaiveCalendar:
+    """A list of [start, end) slots checked one by one"""
+
+    def __init__(self):
+        self.slots = []
+
+    def is_free(self, start, end):
+        return all(e <= start or s >= end for s, e, _ in self.slots)
+
+    def conflicts(self, start, end):
+        return sorted((s, e, i) for s, e, i in self.slots if s < end and e > start)
+
+    def earliest_fit(self, start, duration, latest):
+        # The earliest fit starts at `start` or where some slot ends
+        candidates = sorted({start} | {e for _, e, _ in self.slots if start < e <= latest})
+        return next((t for t in candidates if t <= latest and self.is_free(t, t + duration)), None)
+
+
+def random_calendars(seed, slots=300):
+    rng = random.Random(seed)
+    calendar, naive = SlotCalendar(), NaiveCalendar()
+    for slot_id in range(slots):
+        start = rng.randrange(0, 5000)
+        end = start + rng.choice([1, 5, 10, 30, 120])
+        calendar.add(start, end, slot_id)
+        naive.slots.append((start, end, slot_id))
+    # Removals must split busy blocks correctly again
+    for start, end, slot_id in rng.sample(naive.slots, slots // 3):
+        assert calendar.remove(start, slot_id)
+        naive.slots.remove((start, end, slot_id))
+    return rng, calendar, naive
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_a_naive_calendar(seed):
+    rng, calendar, naive = random_calendars(seed)
+    assert len(calendar) == len(naive.slots)
+    for _ in range(500):
+        start = rng.uniform(-100, 5200)
+        end = start + rng.choice([0.5, 1, 10, 60, 600])
+        assert calendar.is_free(start, end) == naive.is_free(start, end)
+        assert sorted(calendar.conflicts(start, end)) == naive.conflicts(start, end)
+        duration, latest = rng.choice([1, 10, 60, 300]), start + rng.uniform(0, 2000)
+        assert calendar.earliest_fit(start, duration, latest) == naive.earliest_fit(start, duration, latest)
+
+
+def test_adjacent_slots_do_not_overlap():
+    calendar = SlotCalendar()
+    calendar.add(100, 200, 1)
+    assert calendar.is_free(200, 300)
+    assert calendar.is_free(0, 100)
+    assert not calendar.is_free(199, 201)
+    assert not calendar.is_free(50, 150)
+    assert not calendar.is_free(120, 130)
+    assert calendar.conflicts(150, 250) == [(100, 200, 1)]
+
+
+def test_earliest_fit_skips_busy_blocks():
+    calendar = SlotCalendar()
+    for start, end in ((0, 10), (10, 20), (25, 40)):
+        calendar.add(start, end)
+    assert calendar.earliest_fit(0, 5, 100) == 20
+    assert calendar.earliest_fit(0, 6, 100) == 40
+    assert calendar.earliest_fit(0, 6, 39) is None
+    assert calendar.earliest_fit(50, 5, 60) == 50
+
+
+def test_remove_only_the_matching_slot():
+    calendar = SlotCalendar()
+    calendar.add(0, 10, 1)
+    calendar.add(0, 30, 2)
+    calendar.add(20, 25, 3)
+    assert not calendar.remove(0, 4)
+    assert calendar.remove(0, 2)
+    assert calendar.is_free(10, 20)
+    assert not calendar.is_free(5, 6)
+    assert not calendar.is_free(21, 22)
+    assert not calendar.remove(0, 2)
+
+
+def test_calendar_set_loads_per_satellite():
+    calendars = CalendarSet()
+    calendars.load([(2, 50.0, 60.0, 7), (1, 0.0, 10.0, 5), (2, 0.0, 10.0, 6)])
+    assert len(calendars[1]) == 1 and len(calendars[2]) == 2
+    assert calendars[2].is_free(10.0, 50.0)
+    assert calendars[3].is_free(0.0, 100.0)
+
+
+def test_slot_index_loads_each_satellite_once():
+    loads = []
+
+    def loader(satellite_id):
+        loads.append(satellite_id)
+        return [(0.0, 10.0, 1)] if satellite_id == 1 else []
+
+    index = SatelliteSlotIndex(loader)
+    assert not index.is_free(1, 5.0, 6.0)
+    assert index.is_free(2, 5.0, 6.0)
+    index.add(1, 20.0, 30.0, 2)
+    assert not index.is_free(1, 25.0, 26.0)
+    assert loads == [1, 2]
+
+    assert index.remove(1, 20.0, 2)
+    assert index.is_free(1, 25.0, 26.0)
+    assert not index.remove(3, 0.0, 1)  # never loaded
+
+    index.invalidate(1)
+    assert not index.is_free(1, 5.0, 6.0)
+    assert loads == [1, 2, 1]
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from tracking import TrackBank, rts_smooth
+
+
+def straight_line(rng, n=60, dim=3, noise=1.0):
+    """Times, true positions and noisy measurements of a constant-velocity object"""
+    times = np.cumsum(rng.uniform(0.5, 2.0, n))
+    start, velocity = rng.normal(0, 100, dim), rng.normal(0, 5, dim)
+    truth = start + times[:, None] * velocity
+    return times, truth, velocity, truth + rng.normal(0, noise, (n, dim))
+
+
+def test_filter_converges_on_a_constant_velocity_track():
+    rng = np.random.default_rng(1)
+    times, truth, velocity, z = straight_line(rng, n=200, noise=0.5)
+    bank = TrackBank(dim=3, measurement_noise=0.25)
+    for t, m in zip(times, z):
+        bank.ingest(["a"], [t], [m])
+
+    t, x, P = bank.state("a")
+    assert t == times[-1]
+    np.testing.assert_allclose(x[:3], truth[-1], atol=0.5)
+    np.testing.assert_allclose(x[3:], velocity, atol=0.1)
+    assert np.all(np.diag(P) < 0.25)
+    np.testing.assert_allclose(P, P.T)
+    assert bank.update_count("a") == 200
+
+
+def test_one_batch_equals_sequential_ingests():
+    rng = np.random.default_rng(2)
+    tracks = {key: straight_line(rng, n=20) for key in ("a", "b", "c")}
+    sequential, batched = TrackBank(capacity=1), TrackBank(capacity=1)
+
+    keys, times, measurements = [], [], []
+    for key, (t, _, _, z) in tracks.items():
+        for ti, zi in zip(t, z):
+            sequential.ingest([key], [ti], [zi])
+            keys.append(key)
+            times.append(ti)
+            measurements.append(zi)
+    # Shuffled, and each key appears many times in the one batch
+    order = rng.permutation(len(keys))
+    assert batched.ingest([keys[i] for i in order], np.asarray(times)[order], np.asarray(measurements)[order]) == 60
+
+    assert len(batched) == 3
+    for key in tracks:
+        for a, b in zip(sequential.state(key), batched.state(key)):
+            np.testing.assert_allclose(a, b, rtol=1e-9, atol=1e-9)
+
+
+def test_predict_extrapolates_without_storing():
+    bank = TrackBank(dim=2, process_noise=0.0)
+    bank.ingest(["a", "a"], [0.0, 1.0], [[0.0, 0.0], [1.0, 2.0]])
+    before = bank.state("a")
+    x, P = bank.predict(["a"], at=11.0)
+    _, x1, _ = before
+    np.testing.assert_allclose(x[0, :2], x1[:2] + 10.0 * x1[2:])
+    # Without process noise only the position uncertainty grows
+    assert np.all(np.diag(P[0])[:2] > np.diag(before[2])[:2])
+    np.testing.assert_allclose(np.diag(P[0])[2:], np.diag(before[2])[2:])
+    for a, b in zip(bank.state("a"), before):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_drop_keeps_the_other_tracks():
+    bank = TrackBank(dim=1, capacity=2)
+    bank.ingest([1, 2, 3], [0.0, 0.0, 0.0], [[1.0], [2.0], [3.0]])
+    bank.drop(1)
+    assert 1 not in bank and len(bank) == 2
+    assert bank.state(3)[1][0] == 3.0
+    assert bank.state(2)[1][0] == 2.0
+
+
+def test_smoother_ends_at_the_filter_state_and_beats_it_elsewhere():
+    rng = np.random.default_rng(3)
+    runs = [straight_line(rng, n=50, noise=2.0) for _ in range(8)]
+    times = np.stack([r[0] for r in runs])
+    truth = np.stack([r[1] for r in runs])
+    z = np.stack([r[3] for r in runs])
+
+    xs, Ps = rts_smooth(times, z, measurement_noise=4.0)
+    assert xs.shape == (8, 50, 6) and Ps.shape == (8, 50, 6, 6)
+
+    filtered, covariances = [], []
+    for i in range(8):
+        bank = TrackBank(measurement_noise=4.0)
+        for t, m in zip(times[i], z[i]):
+            bank.ingest(["k"], [t], [m])
+            _, x, P = bank.state("k")
+            filtered.append(x)
+            covariances.append(P)
+    filtered = np.reshape(filtered, (8, 50, 6))
+    covariances = np.reshape(covariances, (8, 50, 6, 6))
+
+    np.testing.assert_allclose(xs[:, -1], filtered[:, -1], rtol=1e-8, atol=1e-8)
+    smoothed_error = np.sqrt(np.mean((xs[:, :, :3] - truth) ** 2))
+    filtered_error = np.sqrt(np.mean((filtered[:, :, :3] - truth) ** 2))
+    assert smoothed_error < 0.8 * filtered_error
+    # Smoothing never makes an estimate less certain
+    assert np.all(np.trace(Ps, axis1=-2, axis2=-1) <= np.trace(covariances, axis1=-2, axis2=-1) + 1e-9)
+
+
+def test_nan_padding_leaves_shorter_tracks_unchanged():
+    rng = np.random.default_rng(4)
+    times, _, _, z = straight_line(rng, n=30)
+    short_xs, _ = rts_smooth(times[None, :20], z[None, :20])
+
+    padded_times = np.concatenate((times[:20], np.full(10, times[19])))
+    padded_z = np.concatenate((z[:20], np.full((10, 3), np.nan)))
+    xs, _ = rts_smooth(np.stack((times, padded_times)), np.stack((z, padded_z)))
+    np.testing.assert_allclose(xs[1, :20], short_xs[0], rtol=1e-8, atol=1e-8)
+    assert not np.isnan(xs).any()
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_rts_smooth_any_dimension(dim):
+    rng = np.random.default_rng(dim)
+    times, truth, velocity, z = straight_line(rng, n=40, dim=dim, noise=0.1)
+    xs, _ = rts_smooth(times[None], z[None], dim=dim, measurement_noise=0.01)
+    np.testing.assert_allclose(xs[0, :, dim:], np.broadcast_to(velocity, (40, dim)), atol=0.2)
+
+
+def test_track_routes_filter_and_smooth_stored_measurements(backend, client, make_user):
+    user_id, headers = make_user()
+    db = backend.SessionLocal()
+    try:
+        booking = backend.Booking(user_id=user_id, satellite_id=1, object_name="debris", object_type="debris",
+                                  booking_type="track", status="running")
+        db.add(booking)
+        db.commit()
+        booking_id = booking.id
+    finally:
+        db.close()
+
+    start = datetime(2025, 10, 5)
+    response = client.post("/tracks/measurements", headers=headers, json={"measurements": [
+        {"booking_id": booking_id, "time": (start + timedelta(seconds=10 * k)).isoformat(),
+         "position": [7000.0 + 70.0 * k, 0.0, 0.0]}
+        for k in range(12)
+    ] + [{"booking_id": booking_id + 1000, "time": start.isoformat(), "position": [0.0, 0.0, 0.0]}]})
+    assert response.json() == {"accepted": 12, "rejected_booking_ids": [booking_id + 1000]}
+
+    state = client.get(f"/bookings/{booking_id}/track", headers=headers).json()
+    assert state["updates"] == 12
+    assert state["state"][3] == pytest.approx(7.0, abs=0.5)
+
+    response = client.post("/tracks/smooth", headers=headers, json={"booking_ids": [booking_id, booking_id + 1000]})
+    assert response.status_code == 200, response.text
+    (smoothed,) = response.json()
+    assert smoothed["booking_id"] == booking_id
+    assert len(smoothed["points"]) == 12
+    assert smoothed["points"][-1]["state"][0] == pytest.approx(state["state"][0])
@@ -0,0 +1,222 @@
+"""Batched constant-velocity Kalman tracking for "track" bookings.
+
+A port of the KalmanFilter in simulations/kalman.html, generalised to any
+number of spatial dimensions and run for every tracked object at once: the
+states of all tracks live in stacked arrays x (N, 2d) and P (N, 2d, 2d), so
+predict/update for a batch of measurements is a handful of NumPy operations
+instead of a Python loop per object.
+"""
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+
+def _transition(dt: np.ndarray, dim: int) -> np.ndarray:
+    """F for each dt, shape (n, 2d, 2d)"""
+    n = len(dt)
+    F = np.tile(np.eye(2 * dim), (n, 1, 1))
+    idx = np.arange(dim)
+    F[:, idx, idx + dim] = dt[:, None]
+    return F
+
+
+def _process_noise(dt: np.ndarray, dim: int, q: float) -> np.ndarray:
+    """Continuous white-noise acceleration Q for each dt, shape (n, 2d, 2d)"""
+    n = len(dt)
+    Q = np.zeros((n, 2 * dim, 2 * dim))
+    idx = np.arange(dim)
+    Q[:, idx, idx] = (q * dt ** 3 / 3.0)[:, None]
+    Q[:, idx, idx + dim] = (q * dt ** 2 / 2.0)[:, None]
+    Q[:, idx + dim, idx] = (q * dt ** 2 / 2.0)[:, None]
+    Q[:, idx + dim, idx + dim] = (q * dt)[:, None]
+    return Q
+
+
+def _predict(x, P, dt, dim, q):
+    F = _transition(dt, dim)
+    x = np.einsum("nij,nj->ni", F, x)
+    P = F @ P @ F.transpose(0, 2, 1) + _process_noise(dt, dim, q)
+    return x, P
+
+
+def _update(x, P, z, r, dim):
+    """Measurement update with H = [I 0]; rows where z is NaN are left untouched"""
+    valid = ~np.isnan(z).any(axis=1)
+    if not valid.any():
+        return x, P
+    x, P = x.copy(), P.copy()
+    xv, Pv, zv = x[valid], P[valid], z[valid]
+
+    S = Pv[:, :dim, :dim] + r * np.eye(dim)
+    PHt = Pv[:, :, :dim]
+    # K = P H^T S^-1, solved rather than inverted
+    K = np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)
+    innovation = zv - xv[:, :dim]
+    xv = xv + np.einsum("nij,nj->ni", K, innovation)
+    Pv = Pv - K @ Pv[:, :dim, :]
+    Pv = 0.5 * (Pv + Pv.transpose(0, 2, 1))
+
+    x[valid], P[valid] = xv, Pv
+    return x, P
+
+
+class TrackBank:
+    """Kalman state for many tracked objects, keyed by booking id"""
+
+    def __init__(self, dim: int = 3, process_noise: float = 1e-3, measurement_noise: float = 1.0,
+                 initial_velocity_variance: float = 1e2, capacity: int = 1024):
+        self.dim = dim
+        self.q = process_noise
+        self.r = measurement_noise
+        self.v0 = initial_velocity_variance
+        self._rows: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self.x = np.zeros((capacity, 2 * dim))
+        self.P = np.zeros((capacity, 2 * dim, 2 * dim))
+        self.t = np.zeros(capacity)
+        self.updates = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def _grow(self, needed: int):
+        capacity = len(self.t)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        pad = capacity - len(self.t)
+        self.x = np.concatenate((self.x, np.zeros((pad,) + self.x.shape[1:])))
+        self.P = np.concatenate((self.P, np.zeros((pad,) + self.P.shape[1:])))
+        self.t = np.concatenate((self.t, np.zeros(pad)))
+        self.updates = np.concatenate((self.updates, np.zeros(pad, dtype=np.int64)))
+
+    def _initialise(self, keys: Sequence[Hashable], z: np.ndarray, t: np.ndarray):
+        start = len(self._keys)
+        self._grow(start + len(keys))
+        rows = np.arange(start, start + len(keys))
+        for key, row in zip(keys, rows):
+            self._rows[key] = row
+            self._keys.append(key)
+        d = self.dim
+        self.x[rows] = 0.0
+        self.x[rows, :d] = z
+        self.P[rows] = np.diag([self.r] * d + [self.v0] * d)
+        self.t[rows] = t
+        self.updates[rows] = 1
+
+    def ingest(self, keys: Sequence[Hashable], times: Sequence[float], measurements) -> int:
+        """Apply a batch of (key, time, position) measurements; returns the number applied.
+
+        Unknown keys start a new track from their first measurement. A key may
+        appear several times in one batch; its measurements are applied in
+        time order over successive vectorized rounds.
+        """
+        keys = list(keys)
+        times = np.asarray(times, dtype=np.float64)
+        z = np.asarray(measurements, dtype=np.float64).reshape(len(keys), self.dim)
+        order = np.argsort(times, kind="stable")
+
+        # Round k holds each key's k-th measurement, so a round touches each row once
+        rounds: List[List[int]] = []
+        seen: Dict[Hashable, int] = {}
+        for i in order:
+            k = seen.get(keys[i], 0)
+            seen[keys[i]] = k + 1
+            if k == len(rounds):
+                rounds.append([])
+            rounds[k].append(i)
+
+        applied = 0
+        for batch in rounds:
+            batch = np.asarray(batch, dtype=np.intp)
+            known = np.array([keys[i] in self._rows for i in batch], dtype=bool)
+            new = batch[~known]
+            if len(new):
+                self._initialise([keys[i] for i in new], z[new], times[new])
+                applied += len(new)
+            old = batch[known]
+            if not len(old):
+                continue
+            rows = np.array([self._rows[keys[i]] for i in old])
+            dt = np.maximum(times[old] - self.t[rows], 0.0)
+            x, P = _predict(self.x[rows], self.P[rows], dt, self.dim, self.q)
+            x, P = _update(x, P, z[old], self.r, self.dim)
+            self.x[rows], self.P[rows] = x, P
+            self.t[rows] = np.maximum(self.t[rows], times[old])
+            self.updates[rows] += 1
+            applied += len(old)
+        return applied
+
+    def state(self, key: Hashable) -> Tuple[float, np.ndarray, np.ndarray]:
+        """(time, state vector, covariance) of one track"""
+        row = self._rows[key]
+        return self.t[row], self.x[row].copy(), self.P[row].copy()
+
+    def update_count(self, key: Hashable) -> int:
+        return int(self.updates[self._rows[key]])
+
+    def predict(self, keys: Sequence[Hashable], at: float) -> Tuple[np.ndarray, np.ndarray]:
+        """States and covariances of several tracks propagated to time `at` (not stored)"""
+        rows = np.array([self._rows[k] for k in keys], dtype=np.intp)
+        dt = np.maximum(at - self.t[rows], 0.0)
+        return _predict(self.x[rows], self.P[rows], dt, self.dim, self.q)
+
+    def drop(self, key: Hashable):
+        """Forget a track; the last row is moved into its slot"""
+        row = self._rows.pop(key)
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+            for arr in (self.x, self.P, self.t, self.updates):
+                arr[row] = arr[last]
+        self._keys.pop()
+
+
+def rts_smooth(times, measurements, dim: int = 3, process_noise: float = 1e-3,
+               measurement_noise: float = 1.0, initial_velocity_variance: float = 1e2):
+    """Rauch-Tung-Striebel smoother over many completed tracks at once.
+
+    `times` is (N, T) and `measurements` (N, T, d); shorter tracks are padded
+    with NaN measurements (their times should repeat the last real time).
+    Returns smoothed states (N, T, 2d) and covariances (N, T, 2d, 2d).
+    """
+    times = np.asarray(times, dtype=np.float64)
+    z = np.asarray(measurements, dtype=np.float64)
+    n, steps = times.shape
+    size = 2 * dim
+
+    xf = np.zeros((n, steps, size))
+    Pf = np.zeros((n, steps, size, size))
+    xp = np.zeros_like(xf)
+    Pp = np.zeros_like(Pf)
+    Fs = np.zeros((n, steps, size, size))
+
+    x = np.zeros((n, size))
+    x[:, :dim] = np.nan_to_num(z[:, 0])
+    P = np.tile(np.diag([measurement_noise] * dim + [initial_velocity_variance] * dim), (n, 1, 1))
+    # Tracks whose first sample is missing start from a vague prior instead
+    P[np.isnan(z[:, 0]).any(axis=1), :dim, :dim] *= 1e6
+    xf[:, 0], Pf[:, 0] = x, P
+    xp[:, 0], Pp[:, 0] = x, P
+    Fs[:, 0] = np.eye(size)
+
+    for k in range(1, steps):
+        dt = np.maximum(times[:, k] - times[:, k - 1], 0.0)
+        Fs[:, k] = _transition(dt, dim)
+        x, P = _predict(x, P, dt, dim, process_noise)
+        xp[:, k], Pp[:, k] = x, P
+        x, P = _update(x, P, z[:, k], measurement_noise, dim)
+        xf[:, k], Pf[:, k] = x, P
+
+    xs, Ps = xf.copy(), Pf.copy()
+    for k in range(steps - 2, -1, -1):
+        # C = Pf F^T Pp^-1, computed as a solve against the symmetric Pp
+        C = np.linalg.solve(Pp[:, k + 1], Fs[:, k + 1] @ Pf[:, k]).transpose(0, 2, 1)
+        xs[:, k] = xf[:, k] + np.einsum("nij,nj->ni", C, xs[:, k + 1] - xp[:, k + 1])
+        Ps[:, k] = Pf[:, k] + C @ (Ps[:, k + 1] - Pp[:, k + 1]) @ C.transpose(0, 2, 1)
+    return xs, Ps